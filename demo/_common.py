@@ -0,0 +1,182 @@
+"""Shared palette, fonts and drawing helpers for the demo image scripts.
+
+Imported by generate-diagrams.py and generate-posts.py; generate-all.py
+loads both into one process so each (style, size) font is parsed once.
+"""
+
+import importlib.util
+import math
+import multiprocessing
+import os
+from functools import lru_cache
+from pathlib import Path
+from PIL import Image, ImageFont
+
+HERE = Path(__file__).resolve().parent
+
+W, H = 1200, 675
+BG = (248, 248, 245)
+FG = (45, 45, 45)
+SOFT = (107, 114, 128)
+BLUE = (37, 99, 235)
+GREEN = (22, 163, 74)
+ORANGE = (217, 119, 6)
+RED = (220, 38, 38)
+PURPLE = (124, 58, 237)
+TEAL = (13, 148, 136)
+BORDER = (209, 213, 219)
+CARD = (255, 255, 255)
+YELLOW = (202, 138, 4)
+CYAN = (2, 132, 199)
+HEADER_BG = (37, 42, 52)
+
+# Blank background every image starts from; never drawn on directly.
+_CANVAS = Image.new("RGB", (W, H), BG)
+
+# Fast zlib settings for iterating on the images; --publish trades encode
+# time for the smallest files when regenerating the committed assets.
+PNG_OPTIONS = {"compress_level": 1, "optimize": False}
+PNG_PUBLISH = {"compress_level": 9, "optimize": True}
+
+FONT_PATHS = [
+    "/usr/share/fonts/dejavu-sans-mono-fonts/DejaVuSansMono.ttf",
+    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/fira-code/FiraCode-Regular.ttf",
+    "/usr/share/fonts/redhat/RedHatDisplay-Regular.otf",
+    "/usr/share/fonts/redhat/RedHatDisplay-Bold.otf",
+    "/usr/share/fonts/gnu-free/FreeSans.otf",
+    "/usr/share/fonts/gnu-free/FreeSansBold.otf",
+]
+
+FONT_DIRS = ["/usr/share/fonts", "/usr/local/share/fonts"]
+STYLE_MAP = {"mono": [0, 3], "text": [1, 4, 6], "bold": [2, 5, 7]}
+
+
+def _resolve_font_paths():
+    """Map each FONT_PATHS entry to an existing file, or None.
+
+    Paths missing at their Fedora location are looked up by file name
+    under FONT_DIRS (Debian/Arch layouts), once per process, so
+    load_font never pays for a failed open().
+    """
+    if all(os.path.isfile(p) for p in FONT_PATHS):
+        return list(FONT_PATHS)
+    by_name = {}
+    for top in FONT_DIRS:
+        for root, _dirs, files in os.walk(top):
+            for f in files:
+                by_name.setdefault(f, os.path.join(root, f))
+    return [p if os.path.isfile(p) else by_name.get(os.path.basename(p))
+            for p in FONT_PATHS]
+
+
+_AVAILABLE = _resolve_font_paths()
+
+
+@lru_cache(maxsize=None)
+def load_font(style, size):
+    order = STYLE_MAP.get(style, [0]) + list(range(len(FONT_PATHS)))
+    for idx in order:
+        if _AVAILABLE[idx] is None:
+            continue
+        try:
+            return ImageFont.truetype(_AVAILABLE[idx], size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def new_canvas():
+    """Return a fresh W x H image filled with BG."""
+    return _CANVAS.copy()
+
+
+def rounded_rect(d, xy, fill, outline=None, r=12, width=2):
+    d.rounded_rectangle(xy, radius=r, fill=fill, outline=outline, width=width)
+
+
+# Arrowheads are the shaft direction rotated by +/-0.4 rad.
+_HEAD_COS, _HEAD_SIN = math.cos(0.4), math.sin(0.4)
+
+
+def arrow(d, x1, y1, x2, y2, color, width=2, head=8):
+    d.line([(x1, y1), (x2, y2)], fill=color, width=width)
+    dx, dy = x2 - x1, y2 - y1
+    length = math.hypot(dx, dy)
+    ux, uy = (dx / length, dy / length) if length else (1.0, 0.0)
+    c, s = _HEAD_COS, _HEAD_SIN
+    d.polygon([
+        (x2, y2),
+        (x2 - head * (ux * c + uy * s), y2 - head * (uy * c - ux * s)),
+        (x2 - head * (ux * c - uy * s), y2 - head * (uy * c + ux * s)),
+    ], fill=color)
+
+
+def dashed_line(d, x1, y1, x2, y2, color, width=2, dash=8, gap=6):
+    dx, dy = x2 - x1, y2 - y1
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return
+    ux, uy = dx / length, dy / length
+    segments = [
+        ((x1 + ux * pos, y1 + uy * pos),
+         (x1 + ux * min(pos + dash, length), y1 + uy * min(pos + dash, length)))
+        for pos in range(0, math.ceil(length), dash + gap)
+    ]
+    for seg in segments:
+        d.line(seg, fill=color, width=width)
+
+
+# (text, id(font)) -> (width, height); fonts live for the whole process
+# in the load_font cache, so their ids are stable keys.
+_BBOX_CACHE = {}
+
+
+def text_center(d, x, y, text, font, fill):
+    key = (text, id(font))
+    dims = _BBOX_CACHE.get(key)
+    if dims is None:
+        bb = d.textbbox((0, 0), text, font=font)
+        dims = _BBOX_CACHE[key] = (bb[2] - bb[0], bb[3] - bb[1])
+    tw, th = dims
+    d.text((x - tw // 2, y - th // 2), text, font=font, fill=fill)
+
+
+def parse_args(argv):
+    """Return the positional arguments, applying --publish to PNG_OPTIONS."""
+    args = []
+    for arg in argv:
+        if arg == "--publish":
+            PNG_OPTIONS.update(PNG_PUBLISH)
+        else:
+            args.append(arg)
+    return args
+
+
+@lru_cache(maxsize=None)
+def load_script(filename):
+    """Import one of the hyphenated generate-*.py scripts as a module."""
+    spec = importlib.util.spec_from_file_location(
+        filename.replace("-", "_")[:-3], HERE / filename)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _render(job):
+    filename, func, path, png_options = job
+    PNG_OPTIONS.update(png_options)
+    getattr(load_script(filename), func)(path)
+
+
+def render_parallel(jobs):
+    """Run (script, function name, output path) jobs in a process pool.
+
+    Every image is independent, so each worker imports the script itself
+    and only names and path strings cross the process boundary.
+    """
+    work = [(filename, func, path, dict(PNG_OPTIONS))
+            for filename, func, path in jobs]
+    with multiprocessing.Pool(min(len(work), os.cpu_count() or 1)) as pool:
+        pool.map(_render, work)
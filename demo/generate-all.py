@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Generate every qvm-remote demo image in one run.
+
+Usage: python3 generate-all.py [--publish] <diagram-dir> [<posts-dir>]
+
+Renders the generate-diagrams.py and generate-posts.py images in one
+process pool, so all seven are produced concurrently.  Post images go
+to <diagram-dir> unless <posts-dir> is given.
+"""
+
+import sys
+from pathlib import Path
+
+from _common import load_script, parse_args, render_parallel
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--publish] <diagram-dir> [<posts-dir>]")
+        sys.exit(1)
+
+    outdir = Path(args[0])
+    postdir = Path(args[1]) if len(args) > 1 else outdir
+    outdir.mkdir(parents=True, exist_ok=True)
+    postdir.mkdir(parents=True, exist_ok=True)
+
+    print("Generating diagrams and X post images...")
+    render_parallel(
+        [("generate-diagrams.py", func, str(outdir / name))
+         for func, name in load_script("generate-diagrams.py").DIAGRAMS]
+        + [("generate-posts.py", func, str(postdir / name))
+           for func, name in load_script("generate-posts.py").POSTS]
+    )
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
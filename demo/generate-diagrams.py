@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Generate architecture diagrams for qvm-remote using Pillow.
 
-Usage: python3 generate-diagrams.py <output-dir>
+Usage: python3 generate-diagrams.py [--publish] <output-dir>
 
 Produces four diagrams (1200x675, light academic theme):
   1. architecture.png  — Pull-model protocol overview
@@ -12,91 +12,18 @@ Produces four diagrams (1200x675, light academic theme):
 
 import sys
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-
-W, H = 1200, 675
-BG = (248, 248, 245)
-FG = (45, 45, 45)
-SOFT = (107, 114, 128)
-BLUE = (37, 99, 235)
-GREEN = (22, 163, 74)
-ORANGE = (217, 119, 6)
-RED = (220, 38, 38)
-PURPLE = (124, 58, 237)
-TEAL = (13, 148, 136)
-BORDER = (209, 213, 219)
-CARD = (255, 255, 255)
-YELLOW = (202, 138, 4)
-CYAN = (2, 132, 199)
-
-FONT_PATHS = [
-    "/usr/share/fonts/dejavu-sans-mono-fonts/DejaVuSansMono.ttf",
-    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf",
-    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans-Bold.ttf",
-    "/usr/share/fonts/fira-code/FiraCode-Regular.ttf",
-    "/usr/share/fonts/redhat/RedHatDisplay-Regular.otf",
-    "/usr/share/fonts/redhat/RedHatDisplay-Bold.otf",
-    "/usr/share/fonts/gnu-free/FreeSans.otf",
-    "/usr/share/fonts/gnu-free/FreeSansBold.otf",
-]
-
+from PIL import Image, ImageDraw
 
-def load_font(style, size):
-    style_map = {"mono": [0, 3], "text": [1, 4, 6], "bold": [2, 5, 7]}
-    for idx in style_map.get(style, [0]):
-        try:
-            return ImageFont.truetype(FONT_PATHS[idx], size)
-        except (OSError, IndexError):
-            continue
-    for p in FONT_PATHS:
-        try:
-            return ImageFont.truetype(p, size)
-        except OSError:
-            continue
-    return ImageFont.load_default()
-
-
-def rounded_rect(d, xy, fill, outline=None, r=12, width=2):
-    d.rounded_rectangle(xy, radius=r, fill=fill, outline=outline, width=width)
-
-
-def arrow(d, x1, y1, x2, y2, color, width=2, head=8):
-    d.line([(x1, y1), (x2, y2)], fill=color, width=width)
-    import math
-    angle = math.atan2(y2 - y1, x2 - x1)
-    d.polygon([
-        (x2, y2),
-        (x2 - head * math.cos(angle - 0.4), y2 - head * math.sin(angle - 0.4)),
-        (x2 - head * math.cos(angle + 0.4), y2 - head * math.sin(angle + 0.4)),
-    ], fill=color)
-
-
-def dashed_line(d, x1, y1, x2, y2, color, width=2, dash=8, gap=6):
-    import math
-    dx, dy = x2 - x1, y2 - y1
-    length = math.hypot(dx, dy)
-    if length == 0:
-        return
-    ux, uy = dx / length, dy / length
-    pos = 0
-    while pos < length:
-        end = min(pos + dash, length)
-        d.line([
-            (x1 + ux * pos, y1 + uy * pos),
-            (x1 + ux * end, y1 + uy * end),
-        ], fill=color, width=width)
-        pos = end + gap
-
-
-def text_center(d, x, y, text, font, fill):
-    bb = d.textbbox((0, 0), text, font=font)
-    tw, th = bb[2] - bb[0], bb[3] - bb[1]
-    d.text((x - tw // 2, y - th // 2), text, font=font, fill=fill)
+from _common import (
+    W, H, FG, SOFT, BLUE, GREEN, ORANGE, RED, PURPLE, TEAL, BORDER, CARD,
+    YELLOW, PNG_OPTIONS, load_font, new_canvas, parse_args, render_parallel,
+    rounded_rect, arrow, dashed_line, text_center,
+)
 
 
 # ─── Diagram 1: Architecture ─────────────────────────────────────
-def gen_architecture(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def gen_architecture(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     fb = load_font("bold", 22)
     ft = load_font("text", 14)
@@ -117,11 +44,13 @@ def gen_architecture(outdir):
     rounded_rect(d, (60, 180, 450, 420), fill=(240, 253, 250), outline=TEAL, r=10, width=1)
     d.text((75, 188), "~/.qvm-remote/queue/", font=fm, fill=TEAL)
 
-    for i, (name, col) in enumerate([
-        ("pending/", TEAL), ("running/", YELLOW), ("results/", GREEN)
+    for i, (name, col, tint) in enumerate([
+        ("pending/", TEAL, (204, 251, 241)),
+        ("running/", YELLOW, (254, 249, 195)),
+        ("results/", GREEN, (220, 252, 231)),
     ]):
         y = 218 + i * 42
-        rounded_rect(d, (80, y, 280, y + 32), fill=(*col, 20), outline=col, r=6, width=1)
+        rounded_rect(d, (80, y, 280, y + 32), fill=tint, outline=col, r=6, width=1)
         d.text((95, y + 7), name, font=fm, fill=col)
 
     rounded_rect(d, (80, 348, 280, 380), fill=(248, 245, 255), outline=PURPLE, r=6, width=1)
@@ -136,7 +65,7 @@ def gen_architecture(outdir):
     rounded_rect(d, (590, 125, 870, 160), fill=(239, 246, 255), outline=BLUE, r=8)
     text_center(d, 730, 142, "qvm-remote-dom0 (daemon)", font=fm, fill=BLUE)
 
-    rounded_rect(d, (590, 180, 980, 310), fill=(248, 248, 255), outline=(*BLUE, 80), r=10, width=1)
+    rounded_rect(d, (590, 180, 980, 310), fill=(248, 248, 255), outline=BLUE, r=10, width=1)
     d.text((605, 188), "dom0 storage", font=load_font("text", 12), fill=SOFT)
 
     for i, (name, col) in enumerate([
@@ -155,13 +84,14 @@ def gen_architecture(outdir):
     d.text((490, 165), "stdout / results", font=fs, fill=GREEN)
 
     # Step numbers
+    fn = load_font("bold", 12)
     for i, (x, y, col, txt) in enumerate([
         (55, 140, ORANGE, "1"), (530, 130, BLUE, "2"),
         (590, 210, PURPLE, "3"), (590, 275, RED, "4"),
         (530, 155, GREEN, "5"),
     ]):
         d.ellipse((x - 10, y - 10, x + 10, y + 10), fill=col)
-        text_center(d, x, y, txt, font=load_font("bold", 12), fill=(255, 255, 255))
+        text_center(d, x, y, txt, font=fn, fill=(255, 255, 255))
 
     # Xen bar
     rounded_rect(d, (40, 470, 1000, 510), fill=(254, 226, 226), outline=RED, r=8, width=2)
@@ -183,13 +113,13 @@ def gen_architecture(outdir):
 
     d.text((40, 560), "github.com/GabrieleRisso/qvm-remote", font=fm, fill=SOFT)
 
-    img.save(outdir / "architecture.png")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print(f"  architecture.png ({W}x{H})")
 
 
 # ─── Diagram 2: Security Layers ──────────────────────────────────
-def gen_security(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def gen_security(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     fb = load_font("bold", 22)
     ft = load_font("text", 14)
@@ -206,13 +136,22 @@ def gen_security(outdir):
         ("L5: Transient by Default", GREEN, "Dies on reboot unless explicitly enabled"),
     ]
 
+    # Layer rectangles get a translucent tint, so draw them all on one
+    # RGBA overlay and composite it once before the labels go on top.
+    overlay = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+    od = ImageDraw.Draw(overlay)
     for i, (name, col, desc) in enumerate(layers):
         w = 900 - i * 100
         x = (W - w) // 2
         y = 90 + i * 95
-        # Layer rectangle
-        rounded_rect(d, (x, y, x + w, y + 55), fill=(*col, 30), outline=col, r=10, width=2)
-        text_center(d, W // 2, y + 18, name, font=load_font("bold", 17), fill=col)
+        rounded_rect(od, (x, y, x + w, y + 55), fill=(*col, 30), outline=col, r=10, width=2)
+    img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+    d = ImageDraw.Draw(img)
+
+    fl = load_font("bold", 17)
+    for i, (name, col, desc) in enumerate(layers):
+        y = 90 + i * 95
+        text_center(d, W // 2, y + 18, name, font=fl, fill=col)
         text_center(d, W // 2, y + 40, desc, font=ft, fill=SOFT)
 
     # Brace text
@@ -224,13 +163,13 @@ def gen_security(outdir):
            font=ft, fill=SOFT)
     d.text((40, 615), "github.com/GabrieleRisso/qvm-remote", font=fm, fill=SOFT)
 
-    img.save(outdir / "security.png")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print(f"  security.png ({W}x{H})")
 
 
 # ─── Diagram 3: HMAC Auth Flow ───────────────────────────────────
-def gen_auth_flow(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def gen_auth_flow(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     fb = load_font("bold", 22)
     ft = load_font("text", 14)
@@ -303,13 +242,13 @@ def gen_auth_flow(outdir):
            font=ft, fill=SOFT)
     d.text((40, 615), "github.com/GabrieleRisso/qvm-remote", font=fm, fill=SOFT)
 
-    img.save(outdir / "auth-flow.png")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print(f"  auth-flow.png ({W}x{H})")
 
 
 # ─── Diagram 4: Queue State Machine ──────────────────────────────
-def gen_queue_states(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def gen_queue_states(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     fb = load_font("bold", 22)
     ft = load_font("text", 14)
@@ -327,9 +266,10 @@ def gen_queue_states(outdir):
         ("REJECTED", 380, 370, RED),
     ]
 
+    fn = load_font("bold", 15)
     for name, x, y, col in states:
         rounded_rect(d, (x - 65, y - 25, x + 65, y + 25), fill=CARD, outline=col, r=12, width=2)
-        text_center(d, x, y, name, font=load_font("bold", 15), fill=col)
+        text_center(d, x, y, name, font=fn, fill=col)
 
     transitions = [
         (130, 180, 380, 180, "enqueue", TEAL),
@@ -374,23 +314,32 @@ def gen_queue_states(outdir):
            font=ft, fill=SOFT)
     d.text((40, 615), "github.com/GabrieleRisso/qvm-remote", font=fm, fill=SOFT)
 
-    img.save(outdir / "queue-states.png")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print(f"  queue-states.png ({W}x{H})")
 
 
 # ─── Main ─────────────────────────────────────────────────────────
+DIAGRAMS = [
+    ("gen_architecture", "architecture.png"),
+    ("gen_security", "security.png"),
+    ("gen_auth_flow", "auth-flow.png"),
+    ("gen_queue_states", "queue-states.png"),
+]
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: generate-diagrams.py <output-dir>")
+    args = parse_args(sys.argv[1:])
+    if not args:
+        print("Usage: generate-diagrams.py [--publish] <output-dir>")
         sys.exit(1)
 
-    outdir = Path(sys.argv[1])
+    outdir = Path(args[0])
     outdir.mkdir(parents=True, exist_ok=True)
     print("Generating diagrams...")
-    gen_architecture(outdir)
-    gen_security(outdir)
-    gen_auth_flow(outdir)
-    gen_queue_states(outdir)
+    render_parallel([
+        ("generate-diagrams.py", func, str(outdir / name))
+        for func, name in DIAGRAMS
+    ])
     print("Done.")
 
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Generate X/Twitter post images for qvm-remote.
 
-Usage: python3 generate-posts.py <output-dir>
+Usage: python3 generate-posts.py [--publish] <output-dir>
 
 Produces branded 1200x675 images ready for posting:
   post-1.png  — Architecture overview (pull-model protocol)
@@ -11,57 +11,13 @@ Produces branded 1200x675 images ready for posting:
 
 import sys
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-
-W, H = 1200, 675
-BG = (248, 248, 245)
-FG = (45, 45, 45)
-SOFT = (107, 114, 128)
-BLUE = (37, 99, 235)
-GREEN = (22, 163, 74)
-ORANGE = (217, 119, 6)
-RED = (220, 38, 38)
-PURPLE = (124, 58, 237)
-TEAL = (13, 148, 136)
-BORDER = (209, 213, 219)
-CARD = (255, 255, 255)
-HEADER_BG = (37, 42, 52)
-
-FONT_PATHS = [
-    "/usr/share/fonts/dejavu-sans-mono-fonts/DejaVuSansMono.ttf",
-    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf",
-    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans-Bold.ttf",
-    "/usr/share/fonts/fira-code/FiraCode-Regular.ttf",
-    "/usr/share/fonts/redhat/RedHatDisplay-Regular.otf",
-    "/usr/share/fonts/redhat/RedHatDisplay-Bold.otf",
-    "/usr/share/fonts/gnu-free/FreeSans.otf",
-    "/usr/share/fonts/gnu-free/FreeSansBold.otf",
-]
-
-
-def load_font(style, size):
-    style_map = {"mono": [0, 3], "text": [1, 4, 6], "bold": [2, 5, 7]}
-    for idx in style_map.get(style, [0]):
-        try:
-            return ImageFont.truetype(FONT_PATHS[idx], size)
-        except (OSError, IndexError):
-            continue
-    for p in FONT_PATHS:
-        try:
-            return ImageFont.truetype(p, size)
-        except OSError:
-            continue
-    return ImageFont.load_default()
-
-
-def rounded_rect(d, xy, fill, outline=None, r=8, width=2):
-    d.rounded_rectangle(xy, radius=r, fill=fill, outline=outline, width=width)
+from PIL import ImageDraw
 
-
-def text_center(d, x, y, text, font, fill):
-    bb = d.textbbox((0, 0), text, font=font)
-    tw, th = bb[2] - bb[0], bb[3] - bb[1]
-    d.text((x - tw // 2, y - th // 2), text, font=font, fill=fill)
+from _common import (
+    W, H, FG, SOFT, BLUE, GREEN, ORANGE, RED, PURPLE, TEAL, BORDER, CARD,
+    HEADER_BG, PNG_OPTIONS, load_font, new_canvas, parse_args, render_parallel,
+    rounded_rect, text_center,
+)
 
 
 def badge(d, x, y, text, color=GREEN, size=11):
@@ -90,8 +46,8 @@ def footer(d, caption):
 
 
 # ─── Post 1: Architecture ────────────────────────────────────────
-def post_1(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def post_1(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     header(d, 1)
 
@@ -107,13 +63,14 @@ def post_1(outdir):
     text_center(d, 190, 216, "qvm-remote (client)", font=load_font("mono", 12), fill=ORANGE)
 
     rounded_rect(d, (70, 250, 430, 460), fill=(240, 253, 250), outline=TEAL, r=10, width=1)
-    d.text((85, 258), "~/.qvm-remote/queue/", font=load_font("mono", 12), fill=TEAL)
+    fm = load_font("mono", 12)
+    d.text((85, 258), "~/.qvm-remote/queue/", font=fm, fill=TEAL)
     for i, (name, col) in enumerate([
         ("pending/", TEAL), ("running/", ORANGE), ("results/", GREEN)
     ]):
         y = 288 + i * 38
         rounded_rect(d, (90, y, 280, y + 28), fill=CARD, outline=col, r=6, width=1)
-        d.text((100, y + 5), name, font=load_font("mono", 12), fill=col)
+        d.text((100, y + 5), name, font=fm, fill=col)
     rounded_rect(d, (90, 402, 280, 430), fill=(248, 245, 255), outline=PURPLE, r=6, width=1)
     d.text((100, 408), "auth.key (0600)", font=load_font("mono", 11), fill=PURPLE)
 
@@ -130,12 +87,12 @@ def post_1(outdir):
         ("3. Execute (sandbox)", RED, 340),
         ("4. Write results back", GREEN, 380),
     ]
+    fs = load_font("text", 13)
     for text, col, y in steps:
         rounded_rect(d, (590, y, 980, y + 30), fill=CARD, outline=col, r=6, width=1)
-        d.text((605, y + 6), text, font=load_font("text", 13), fill=col)
+        d.text((605, y + 6), text, font=fs, fill=col)
 
     # Arrows
-    import math
     d.line([(456, 216), (555, 216)], fill=BLUE, width=3)
     d.polygon([(555, 216), (545, 210), (545, 222)], fill=BLUE)
     d.text((465, 196), "qvm-run --pass-io", font=load_font("mono", 10), fill=BLUE)
@@ -150,13 +107,13 @@ def post_1(outdir):
                 font=load_font("bold", 14), fill=RED)
 
     footer(d, "Pull model: VM writes a file. dom0 chooses to read it.")
-    img.save(outdir / "post-1.png", "PNG")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print("  post-1.png (architecture)")
 
 
 # ─── Post 2: Security Layers ─────────────────────────────────────
-def post_2(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def post_2(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     header(d, 2)
 
@@ -178,22 +135,24 @@ def post_2(outdir):
          "Service dies on reboot | enable requires interactive confirmation"),
     ]
 
+    fl = load_font("bold", 16)
+    fd = load_font("text", 12)
     for i, (name, col, desc) in enumerate(layers):
         w = 960 - i * 70
         x = (W - w) // 2
         y = 150 + i * 85
         rounded_rect(d, (x, y, x + w, y + 55), fill=CARD, outline=col, r=10, width=2)
-        text_center(d, W // 2, y + 18, name, font=load_font("bold", 16), fill=col)
-        text_center(d, W // 2, y + 40, desc, font=load_font("text", 12), fill=SOFT)
+        text_center(d, W // 2, y + 18, name, font=fl, fill=col)
+        text_center(d, W // 2, y + 40, desc, font=fd, fill=SOFT)
 
     footer(d, "Breach one layer — four remain. Defense in depth per NIST SP 800-53.")
-    img.save(outdir / "post-2.png", "PNG")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print("  post-2.png (security)")
 
 
 # ─── Post 3: Terminal Demo ───────────────────────────────────────
-def post_3(outdir):
-    img = Image.new("RGB", (W, H), BG)
+def post_3(path):
+    img = new_canvas()
     d = ImageDraw.Draw(img)
     header(d, 3)
 
@@ -242,21 +201,29 @@ def post_3(outdir):
             break
 
     footer(d, "SSH-like convenience. HMAC-SHA256 security. Zero dependencies.")
-    img.save(outdir / "post-3.png", "PNG")
+    img.save(path, "PNG", **PNG_OPTIONS)
     print("  post-3.png (terminal)")
 
 
+POSTS = [
+    ("post_1", "post-1.png"),
+    ("post_2", "post-2.png"),
+    ("post_3", "post-3.png"),
+]
+
+
 def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <output-dir>")
+    args = parse_args(sys.argv[1:])
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--publish] <output-dir>")
         sys.exit(1)
 
-    outdir = Path(sys.argv[1])
+    outdir = Path(args[0])
     outdir.mkdir(parents=True, exist_ok=True)
     print("Generating X post images...")
-    post_1(outdir)
-    post_2(outdir)
-    post_3(outdir)
+    render_parallel([
+        ("generate-posts.py", func, str(outdir / name)) for func, name in POSTS
+    ])
     print("Done.")
 
 
@@ -15,10 +15,23 @@ Follows Qubes OS 4.3 visual style guide and community UX guidelines:
 
 from __future__ import annotations
 
+import codecs
+import functools
+import gzip
+import heapq
 import os
+import re
+import selectors
+import shutil
+import signal
 import subprocess
 import sys
+import tarfile
 import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
 from pathlib import Path
 
 
@@ -29,13 +42,11 @@ def _read_version():
         os.path.dirname(os.path.abspath(__file__)),
         "/usr/lib/qvm-remote",
     ]:
-        vf = os.path.join(d, "version")
-        if os.path.isfile(vf):
-            try:
-                with open(vf) as f:
-                    return f.read().strip()
-            except OSError:
-                pass
+        try:
+            with open(os.path.join(d, "version")) as f:
+                return f.read().strip()
+        except OSError:
+            pass
     return "1.1.0"
 
 
@@ -76,21 +87,23 @@ def require_gtk():
         sys.exit(1)
 
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
 def valid_hex_key(key):
     """Return True if key is a valid 64-character hex string."""
-    if len(key) != 64:
-        return False
-    try:
-        int(key, 16)
-        return True
-    except ValueError:
-        return False
+    return len(key) == 64 and _HEX_DIGITS.issuperset(key)
 
 
-import gi  # noqa: E402
+try:
+    import gi  # noqa: E402
 
-gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, Gdk, GLib, Pango  # noqa: E402
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gtk, Gdk, GLib  # noqa: E402
+except (ValueError, ImportError):
+    # Headless import: the file, log and backup helpers still work, and
+    # the GUIs report the missing dependency through require_gtk().
+    Gtk = Gdk = GLib = None
 
 # ── Qubes OS color palette ──────────────────────────────────────────
 # From https://www.qubes-os.org/doc/visual-style-guide/
@@ -141,6 +154,7 @@ textview.qvm-output text {
     font-family: "Source Code Pro", "DejaVu Sans Mono", monospace;
     font-size: 10px;
     padding: 6px;
+    color: #333333;
 }
 
 /* Section frame labels */
@@ -148,23 +162,6 @@ label.qvm-section {
     font-weight: bold;
 }
 
-/* Status indicator labels */
-label.qvm-status-active {
-    color: #5ad840;
-    font-weight: bold;
-}
-label.qvm-status-inactive {
-    color: #888888;
-}
-label.qvm-status-error {
-    color: #bd2727;
-    font-weight: bold;
-}
-label.qvm-status-warning {
-    color: #e79e27;
-    font-weight: bold;
-}
-
 /* Key display */
 label.qvm-key-text {
     font-family: "Source Code Pro", "DejaVu Sans Mono", monospace;
@@ -178,136 +175,227 @@ label.qvm-key-text {
 """
 
 
+_QUBES_CSS_BYTES = QUBES_CSS.encode()
+_css_provider = None
+_css_screens = weakref.WeakSet()
+
+
 def apply_css():
-    """Apply Qubes-style CSS to the default screen."""
-    provider = Gtk.CssProvider()
-    provider.load_from_data(QUBES_CSS.encode())
+    """Apply Qubes-style CSS to the default screen.
+
+    The provider is parsed once and registered at most once per screen,
+    so calling this from several windows is cheap.
+    """
+    global _css_provider
+    screen = Gdk.Screen.get_default()
+    if screen in _css_screens:
+        return
+    if _css_provider is None:
+        _css_provider = Gtk.CssProvider()
+        _css_provider.load_from_data(_QUBES_CSS_BYTES)
     Gtk.StyleContext.add_provider_for_screen(
-        Gdk.Screen.get_default(),
-        provider,
+        screen,
+        _css_provider,
         Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
     )
+    _css_screens.add(screen)
 
 
 # ── Reusable widgets ───────────────────────────────────────────────
 
 
-class StatusIndicator(Gtk.Box):
-    """Colored circle with status text, like Qubes system tray indicators."""
-
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    ERROR = "error"
-    WARNING = "warning"
-
-    _CSS_MAP = {
-        "active": "qvm-status-active",
-        "inactive": "qvm-status-inactive",
-        "error": "qvm-status-error",
-        "warning": "qvm-status-warning",
-    }
-    _SYMBOL_MAP = {
-        "active": "\u25cf",  # ● filled circle
-        "inactive": "\u25cb",  # ○ empty circle
-        "error": "\u25cf",
-        "warning": "\u25cf",
-    }
-
-    def __init__(self, text="Unknown", state="inactive"):
-        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        self._dot = Gtk.Label()
-        self._label = Gtk.Label()
-        self.pack_start(self._dot, False, False, 0)
-        self.pack_start(self._label, False, False, 0)
-        self.set_state(state, text)
-
-    def set_state(self, state, text=None):
-        css = self._CSS_MAP.get(state, "qvm-status-inactive")
-        sym = self._SYMBOL_MAP.get(state, "\u25cb")
-        for w in (self._dot, self._label):
-            ctx = w.get_style_context()
-            for c in self._CSS_MAP.values():
-                ctx.remove_class(c)
-            ctx.add_class(css)
-        self._dot.set_text(sym)
-        if text is not None:
-            self._label.set_text(text)
-
-
-class OutputView(Gtk.ScrolledWindow):
-    """Scrollable monospace text view with stdout/stderr color tags.
-
-    Thread-safe: all append methods schedule via GLib.idle_add internally.
-    """
-
-    def __init__(self):
-        super().__init__()
-        self.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        self.set_vexpand(True)
-        self.set_hexpand(True)
-        self.set_min_content_height(150)
-
-        self._view = Gtk.TextView()
-        self._view.set_editable(False)
-        self._view.set_cursor_visible(False)
-        self._view.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
-        self._view.get_style_context().add_class("qvm-output")
-        self.add(self._view)
-
-        buf = self._view.get_buffer()
-        buf.create_tag("stdout", foreground="#333333")
-        buf.create_tag(
-            "stderr", foreground=QUBES_COLORS["red_danger"], weight=Pango.Weight.BOLD
-        )
-        buf.create_tag("info", foreground=QUBES_COLORS["blue_primary"])
-        buf.create_tag(
-            "success",
-            foreground=QUBES_COLORS["green_success"],
-            weight=Pango.Weight.BOLD,
-        )
-
-    def append(self, text, tag_name="stdout"):
-        """Append text with a named tag. Safe to call from any thread."""
-        GLib.idle_add(self._do_append, text, tag_name)
-
-    def _do_append(self, text, tag_name):
-        buf = self._view.get_buffer()
-        end_iter = buf.get_end_iter()
-        tag = buf.get_tag_table().lookup(tag_name)
-        if tag:
-            buf.insert_with_tags(end_iter, text, tag)
-        else:
-            buf.insert(end_iter, text)
-        self._scroll_to_end()
-        return False  # remove idle callback
-
-    def clear(self):
-        """Clear all output. Safe to call from any thread."""
-        GLib.idle_add(self._do_clear)
-
-    def _do_clear(self):
-        self._view.get_buffer().set_text("")
-        return False
-
-    def _scroll_to_end(self):
-        adj = self.get_vadjustment()
-        adj.set_value(adj.get_upper() - adj.get_page_size())
+if Gtk is not None:
+    class StatusIndicator(Gtk.Box):
+        """Colored circle with status text, like Qubes system tray indicators."""
+
+        ACTIVE = "active"
+        INACTIVE = "inactive"
+        ERROR = "error"
+        WARNING = "warning"
+
+        # state -> (opening span, symbol)
+        _STATE_MARKUP = {
+            "active": (
+                f'<span foreground="{QUBES_COLORS["green_success"]}" weight="bold">',
+                "\u25cf",  # ● filled circle
+            ),
+            "inactive": (
+                f'<span foreground="{QUBES_COLORS["gray_sub"]}">',
+                "\u25cb",  # ○ empty circle
+            ),
+            "error": (
+                f'<span foreground="{QUBES_COLORS["red_danger"]}" weight="bold">',
+                "\u25cf",
+            ),
+            "warning": (
+                f'<span foreground="{QUBES_COLORS["orange_warn"]}" weight="bold">',
+                "\u25cf",
+            ),
+        }
+
+        def __init__(self, text="Unknown", state="inactive"):
+            super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+            self._dot = Gtk.Label()
+            self._label = Gtk.Label()
+            self.pack_start(self._dot, False, False, 0)
+            self.pack_start(self._label, False, False, 0)
+            self._cur_state = None
+            self._cur_text = ""
+            self.set_state(state, text)
+
+        def set_state(self, state, text=None):
+            # Colors are applied as Pango markup rather than CSS classes, so a
+            # state change does not re-resolve the style cascade.
+            if state not in self._STATE_MARKUP:
+                state = "inactive"
+            if text is None:
+                text = self._cur_text
+            if state == self._cur_state and text == self._cur_text:
+                return
+            span, symbol = self._STATE_MARKUP[state]
+            if state != self._cur_state:
+                self._dot.set_markup(f"{span}{symbol}</span>")
+            self._label.set_markup(f"{span}{GLib.markup_escape_text(text)}</span>")
+            self._cur_state = state
+            self._cur_text = text
+
+
+    class OutputView(Gtk.ScrolledWindow):
+        """Scrollable monospace text view with stdout/stderr color tags.
+
+        Thread-safe: appends are queued and applied by a single GLib.idle_add
+        flush, which joins consecutive chunks with the same tag into one
+        insert. The buffer keeps at most MAX_LINES lines; older output is
+        dropped.
+        """
 
-    def get_text(self):
-        buf = self._view.get_buffer()
-        return buf.get_text(buf.get_start_iter(), buf.get_end_iter(), False)
+        MAX_LINES = 5000
+        _BOLD = 700  # Pango.Weight.BOLD, without importing Pango
+
+        def __init__(self):
+            super().__init__()
+            self.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+            self.set_vexpand(True)
+            self.set_hexpand(True)
+            self.set_min_content_height(150)
+
+            self._view = Gtk.TextView()
+            self._view.set_editable(False)
+            self._view.set_cursor_visible(False)
+            self._view.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
+            self._view.get_style_context().add_class("qvm-output")
+            self.add(self._view)
+
+            buf = self._view.get_buffer()
+            self._tags = {
+                "stdout": buf.create_tag("stdout", foreground="#333333"),
+                "stderr": buf.create_tag(
+                    "stderr", foreground=QUBES_COLORS["red_danger"], weight=self._BOLD
+                ),
+                "info": buf.create_tag("info", foreground=QUBES_COLORS["blue_primary"]),
+                "success": buf.create_tag(
+                    "success",
+                    foreground=QUBES_COLORS["green_success"],
+                    weight=self._BOLD,
+                ),
+            }
+            # Right gravity keeps the mark after text inserted at the end
+            self._end_mark = buf.create_mark("end", buf.get_end_iter(), False)
+
+            self._pending = deque()
+            self._pending_lock = threading.Lock()
+            self._flush_scheduled = False
+
+        def append(self, text, tag_name="stdout"):
+            """Append text with a named tag. Safe to call from any thread."""
+            self._enqueue((text, tag_name))
+
+        def clear(self):
+            """Clear all output. Safe to call from any thread."""
+            self._enqueue(None)
+
+        def _enqueue(self, item):
+            """Queue an append (or None for clear); one idle flush per batch."""
+            with self._pending_lock:
+                self._pending.append(item)
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
+            GLib.idle_add(self._flush)
+
+        def _flush(self):
+            """Apply queued appends in order, one insert per run of equal tags."""
+            with self._pending_lock:
+                items, self._pending = self._pending, deque()
+                self._flush_scheduled = False
+            run_tag, chunks = None, []
+            for item in items:
+                if item is None:
+                    # Text queued before a clear would be wiped anyway
+                    run_tag, chunks = None, []
+                    self._do_clear()
+                    continue
+                text, tag_name = item
+                if tag_name != run_tag and chunks:
+                    self._insert("".join(chunks), run_tag)
+                    chunks = []
+                run_tag = tag_name
+                chunks.append(text)
+            if chunks:
+                self._insert("".join(chunks), run_tag)
+            self._trim()
+            self._scroll_to_end()
+            return False  # remove idle callback
+
+        def _insert(self, text, tag_name):
+            buf = self._view.get_buffer()
+            end_iter = buf.get_end_iter()
+            # stdout uses the CSS default color, so it is inserted untagged
+            tag = None if tag_name == "stdout" else self._tags.get(tag_name)
+            if tag:
+                buf.insert_with_tags(end_iter, text, tag)
+            else:
+                buf.insert(end_iter, text)
+
+        def _trim(self):
+            buf = self._view.get_buffer()
+            excess = buf.get_line_count() - self.MAX_LINES
+            if excess > 0:
+                buf.delete(buf.get_start_iter(), buf.get_iter_at_line(excess))
+
+        def _do_clear(self):
+            self._view.get_buffer().set_text("")
+
+        def _scroll_to_end(self):
+            self._view.scroll_mark_onscreen(self._end_mark)
+
+        def get_text(self):
+            buf = self._view.get_buffer()
+            return buf.get_text(buf.get_start_iter(), buf.get_end_iter(), False)
 
 
 class CommandRunner:
     """Run a subprocess in a background thread with streaming output.
 
     All callbacks are dispatched to the GTK main thread via GLib.idle_add.
+    Output is queued and drained by a single idle callback, so a chatty
+    process wakes the main loop once per batch rather than once per line;
+    flushes are at least FLUSH_INTERVAL seconds apart.
     """
 
+    PIPE_SIZE = 1 << 20
+    READ_SIZE = 1 << 16
+    FLUSH_INTERVAL = 0.05
+    KILL_TIMEOUT_MS = 2000
+
     def __init__(self):
         self._proc = None
         self._thread = None
         self._cancelled = False
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._last_flush = 0.0
 
     @property
     def is_running(self):
@@ -319,8 +407,10 @@ class CommandRunner:
         Args:
             args: Command arguments list.
             stdin_data: Optional bytes to write to stdin.
-            on_stdout: Callback(text) for each stdout line.
-            on_stderr: Callback(text) for each stderr line.
+            on_stdout: Callback(text) with one or more whole stdout lines,
+                coalesced at most once per FLUSH_INTERVAL.
+            on_stderr: Callback(text) with one or more whole stderr lines,
+                coalesced the same way.
             on_done: Callback(returncode) when command finishes.
         """
         if self.is_running:
@@ -334,65 +424,132 @@ class CommandRunner:
         self._thread.start()
 
     def cancel(self):
-        """Terminate the running process."""
+        """Terminate the running process and any children it started.
+
+        The process group gets SIGTERM now and SIGKILL after
+        KILL_TIMEOUT_MS, for anything that ignored the first signal.
+        """
         self._cancelled = True
-        if self._proc:
+        proc = self._proc
+        if proc and proc.returncode is None:
             try:
-                self._proc.terminate()
+                os.killpg(proc.pid, signal.SIGTERM)
             except OSError:
-                pass
+                return
+            GLib.timeout_add(self.KILL_TIMEOUT_MS, self._force_kill, proc.pid)
+
+    @staticmethod
+    def _force_kill(pgid):
+        # Also reaches children that ignored SIGTERM after the leader exited
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except OSError:
+            pass  # group already gone
+        return False  # one-shot timeout
+
+    def _dispatch(self, callback, arg):
+        """Queue callback(arg) for the main thread. Safe from any thread."""
+        with self._pending_lock:
+            self._pending.append((callback, arg))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            wait = self._last_flush + self.FLUSH_INTERVAL - time.monotonic()
+        if wait > 0:
+            GLib.timeout_add(int(wait * 1000) + 1, self._flush,
+                             priority=GLib.PRIORITY_DEFAULT_IDLE)
+        else:
+            GLib.idle_add(self._flush)
+
+    def _flush(self):
+        """Run queued callbacks in order, joining consecutive text chunks."""
+        with self._pending_lock:
+            items, self._pending = self._pending, deque()
+            self._flush_scheduled = False
+            self._last_flush = time.monotonic()
+        text_cb, chunks = None, []
+        for callback, arg in items:
+            if isinstance(arg, str) and callback is text_cb:
+                chunks.append(arg)
+                continue
+            if chunks:
+                text_cb("".join(chunks))
+            if isinstance(arg, str):
+                text_cb, chunks = callback, [arg]
+            else:
+                text_cb, chunks = None, []
+                callback(arg)
+        if chunks:
+            text_cb("".join(chunks))
+        return False  # remove idle callback
 
     def _run_thread(self, args, stdin_data, on_stdout, on_stderr, on_done):
         rc = -1
         try:
-            self._proc = subprocess.Popen(
-                args,
+            # A session of its own lets cancel() signal the whole group.
+            popen_kw = dict(
                 stdin=subprocess.PIPE if stdin_data else subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                start_new_session=True,
             )
+            if sys.version_info >= (3, 10):
+                popen_kw["pipesize"] = self.PIPE_SIZE
+            self._proc = subprocess.Popen(args, **popen_kw)
+            # One selector loop feeds stdin and drains both pipes in large
+            # blocks, handing on whole lines; the incremental decoders keep
+            # multi-byte characters that straddle two reads intact.
+            sel = selectors.DefaultSelector()
+            for pipe, callback in ((self._proc.stdout, on_stdout),
+                                   (self._proc.stderr, on_stderr)):
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                sel.register(pipe.fileno(), selectors.EVENT_READ,
+                             [callback, decoder, ""])
             if stdin_data:
-                try:
-                    self._proc.stdin.write(
-                        stdin_data if isinstance(stdin_data, bytes) else stdin_data.encode()
-                    )
-                except OSError:
-                    pass
-                finally:
-                    try:
-                        self._proc.stdin.close()
-                    except OSError:
-                        pass
-
-            def _read_pipe(pipe, callback):
-                try:
-                    while True:
-                        line = pipe.readline()
-                        if not line:
-                            break
-                        if self._cancelled:
-                            break
-                        text = line.decode(errors="replace")
-                        if callback:
-                            GLib.idle_add(callback, text)
-                except Exception:
-                    pass
-
-            t_out = threading.Thread(
-                target=_read_pipe, args=(self._proc.stdout, on_stdout), daemon=True
-            )
-            t_err = threading.Thread(
-                target=_read_pipe, args=(self._proc.stderr, on_stderr), daemon=True
-            )
-            t_out.start()
-            t_err.start()
+                pending = memoryview(
+                    stdin_data if isinstance(stdin_data, bytes) else stdin_data.encode()
+                )
+                os.set_blocking(self._proc.stdin.fileno(), False)
+                sel.register(self._proc.stdin.fileno(), selectors.EVENT_WRITE)
+            deadline = None
+            with sel:
+                while sel.get_map() and not self._cancelled:
+                    if deadline is None:
+                        if self._proc.poll() is not None:
+                            # Children may keep the pipes open after exit
+                            deadline = time.monotonic() + 3
+                    elif time.monotonic() > deadline:
+                        break
+                    for key, _ in sel.select(0.1):
+                        state = key.data
+                        if state is None:
+                            # stdin: write what fits without blocking
+                            try:
+                                pending = pending[os.write(key.fd, pending[:self.READ_SIZE]):]
+                            except BlockingIOError:
+                                continue
+                            except OSError:
+                                pending = pending[:0]  # child closed its stdin
+                            if not pending:
+                                sel.unregister(key.fd)
+                                self._proc.stdin.close()
+                            continue
+                        chunk = os.read(key.fd, self.READ_SIZE)
+                        text = state[2] + state[1].decode(chunk, final=not chunk)
+                        if chunk:
+                            cut = text.rfind("\n") + 1
+                            text, state[2] = text[:cut], text[cut:]
+                        else:
+                            sel.unregister(key.fd)
+                        if text and state[0]:
+                            self._dispatch(state[0], text)
+            if self._proc.stdin:
+                self._proc.stdin.close()
             self._proc.wait()
-            t_out.join(timeout=3)
-            t_err.join(timeout=3)
             rc = self._proc.returncode
         except FileNotFoundError:
             if on_stderr:
-                GLib.idle_add(
+                self._dispatch(
                     on_stderr,
                     f"Command not found: {args[0]}\n"
                     "Make sure qvm-remote is installed.\n",
@@ -400,12 +557,12 @@ class CommandRunner:
             rc = 127
         except Exception as exc:
             if on_stderr:
-                GLib.idle_add(on_stderr, f"Error: {exc}\n")
+                self._dispatch(on_stderr, f"Error: {exc}\n")
             rc = -1
         finally:
             self._proc = None
         if on_done:
-            GLib.idle_add(on_done, rc)
+            self._dispatch(on_done, rc)
 
 
 # ── Helper functions ────────────────────────────────────────────────
@@ -421,11 +578,17 @@ def create_header_bar(title, subtitle=None):
     return hb
 
 
+@functools.lru_cache(maxsize=32)
+def _bold_markup(text):
+    """Return escaped bold markup for a (usually static) label."""
+    return f"<b>{GLib.markup_escape_text(text)}</b>"
+
+
 def create_frame(label_text):
     """Create a Gtk.Frame with a bold label."""
     frame = Gtk.Frame()
     label = Gtk.Label()
-    label.set_markup(f"<b>{GLib.markup_escape_text(label_text)}</b>")
+    label.set_markup(_bold_markup(label_text))
     label.get_style_context().add_class("qvm-section")
     frame.set_label_widget(label)
     frame.set_shadow_type(Gtk.ShadowType.NONE)
@@ -446,57 +609,114 @@ def create_info_row(label_text, value_text=""):
     return box, val
 
 
-def show_error_dialog(parent, title, message):
-    """Show a modal error dialog with an OK button."""
+def _message_dialog(parent, message_type, buttons, title, message):
     dlg = Gtk.MessageDialog(
         transient_for=parent,
         modal=True,
-        message_type=Gtk.MessageType.ERROR,
-        buttons=Gtk.ButtonsType.OK,
+        message_type=message_type,
+        buttons=buttons,
         text=title,
     )
     dlg.format_secondary_text(message)
-    dlg.run()
+    return dlg
+
+
+def _on_message_response(dlg, response, callback):
     dlg.destroy()
+    if callback:
+        callback(response)
+
+
+def show_error_dialog(parent, title, message):
+    """Show a modal error dialog with an OK button.
+
+    Returns immediately; the dialog closes itself on response, so no
+    nested main loop runs while it is open.
+    """
+    dlg = _message_dialog(parent, Gtk.MessageType.ERROR,
+                          Gtk.ButtonsType.OK, title, message)
+    dlg.connect("response", _on_message_response, None)
+    dlg.show()
 
 
 def show_info_dialog(parent, title, message):
-    """Show a modal info dialog."""
-    dlg = Gtk.MessageDialog(
-        transient_for=parent,
-        modal=True,
-        message_type=Gtk.MessageType.INFO,
-        buttons=Gtk.ButtonsType.OK,
-        text=title,
-    )
-    dlg.format_secondary_text(message)
-    dlg.run()
-    dlg.destroy()
+    """Show a modal info dialog. Returns immediately, like show_error_dialog."""
+    dlg = _message_dialog(parent, Gtk.MessageType.INFO,
+                          Gtk.ButtonsType.OK, title, message)
+    dlg.connect("response", _on_message_response, None)
+    dlg.show()
 
 
-def show_confirm_dialog(parent, title, message):
-    """Show a Yes/No confirmation dialog. Returns True if Yes."""
-    dlg = Gtk.MessageDialog(
-        transient_for=parent,
-        modal=True,
-        message_type=Gtk.MessageType.QUESTION,
-        buttons=Gtk.ButtonsType.YES_NO,
-        text=title,
-    )
-    dlg.format_secondary_text(message)
+def show_confirm_dialog(parent, title, message, callback=None):
+    """Show a Yes/No confirmation dialog.
+
+    With a callback, returns immediately and later calls callback(True)
+    if Yes was chosen (False otherwise). Without one, blocks in
+    Gtk.Dialog.run() and returns True if Yes.
+    """
+    dlg = _message_dialog(parent, Gtk.MessageType.QUESTION,
+                          Gtk.ButtonsType.YES_NO, title, message)
+    if callback is not None:
+        dlg.connect("response", _on_message_response,
+                    lambda r: callback(r == Gtk.ResponseType.YES))
+        dlg.show()
+        return None
     result = dlg.run()
     dlg.destroy()
     return result == Gtk.ResponseType.YES
 
 
+def _cache_hits(func):
+    """Memoize func, but never remember a None result.
+
+    A tool that is missing now is looked up again on the next call, so
+    installing it takes effect without clearing the cache.
+    """
+    cache = {}
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        try:
+            return cache[args]
+        except KeyError:
+            pass
+        result = func(*args)
+        if result is not None:
+            cache[args] = result
+        return result
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def which(name):
+    """shutil.which(), memoized per PATH value (hits only)."""
+    return _which(name, os.environ.get("PATH", os.defpath))
+
+
+@_cache_hits
+def _which(name, path):
+    return shutil.which(name, path=path)
+
+
 def find_executable(name, extra_paths=None):
     """Locate an executable by name, checking extra paths first."""
-    paths = list(extra_paths or [])
+    return _find_executable(
+        name,
+        tuple(extra_paths or ()),
+        os.path.expanduser("~/bin"),
+        os.environ.get("PATH", os.defpath),
+    )
+
+
+@_cache_hits
+def _find_executable(name, extra_paths, home_bin, path):
+    paths = list(extra_paths)
     paths.extend(
         [
             "/usr/bin",
             "/usr/local/bin",
-            os.path.expanduser("~/bin"),
+            home_bin,
         ]
     )
     for p in paths:
@@ -504,16 +724,32 @@ def find_executable(name, extra_paths=None):
         if os.path.isfile(full) and os.access(full, os.X_OK):
             return full
     # Fall back to PATH
-    import shutil
+    return _which(name, path)
 
-    return shutil.which(name)
+
+def _clear_executable_cache():
+    """Forget memoized lookups, e.g. after removing or moving a tool."""
+    _which.cache_clear()
+    _find_executable.cache_clear()
+
+
+which.cache_clear = _clear_executable_cache
+find_executable.cache_clear = _clear_executable_cache
 
 
 def run_quick(args, timeout=30):
     """Run a command synchronously, return (returncode, stdout, stderr)."""
+    # Resolve bare names through the memoized PATH lookup so the child
+    # does not repeat the execvp search; argv[0] is left unchanged.
+    executable = None
+    if args and os.sep not in args[0]:
+        executable = which(args[0])
+        if executable is None:
+            return 127, "", f"Command not found: {args[0]}\n"
     try:
         r = subprocess.run(
             args,
+            executable=executable,
             capture_output=True,
             text=True,
             timeout=timeout,
@@ -559,9 +795,7 @@ def send_notification(summary, body="", icon=NOTIFY_ICON_INFO,
         urgency: "low", "normal", or "critical".
         timeout_ms: Display duration in milliseconds.
     """
-    import shutil
-
-    notify_bin = shutil.which("notify-send")
+    notify_bin = which("notify-send")
     if not notify_bin:
         return
     args = [
@@ -584,36 +818,93 @@ def send_notification(summary, body="", icon=NOTIFY_ICON_INFO,
         pass
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(size_bytes):
     """Format byte count as human-readable string."""
-    for unit in ("B", "KB", "MB", "GB"):
-        if abs(size_bytes) < 1024.0:
-            return f"{size_bytes:.1f} {unit}" if unit != "B" else f"{size_bytes} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # floor(log1024(n)) straight from the bit length, capped at TB
+    exp = min(4, max(0, (int(abs(size_bytes)).bit_length() - 1) // 10))
+    if exp == 0:
+        return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (10 * exp)):.1f} {_SIZE_UNITS[exp]}"
 
 
 # ── Backup and change tracking ────────────────────────────────────
 
+# Backups are mostly small text files; fast compression keeps the UI
+# responsive and the archives stay plain .tar.gz either way.
+BACKUP_GZIP_LEVEL = 1
+BACKUP_BUFFER_SIZE = 1 << 20
+
+
+def _native_backup(tar, compressor, data_dir, out):
+    """Stream `tar -c data_dir | compressor` into the open file out.
+
+    Returns:
+        An error message, or None on success.
+    """
+    comp = subprocess.Popen([compressor, f"-{BACKUP_GZIP_LEVEL}"],
+                            stdin=subprocess.PIPE, stdout=out)
+    try:
+        r = subprocess.run(
+            [tar, "-cf", "-", "-C", str(data_dir.parent), data_dir.name],
+            stdout=comp.stdin, stderr=subprocess.PIPE,
+        )
+    finally:
+        comp.stdin.close()
+        crc = comp.wait()
+    # GNU tar exits 1 when a file (e.g. the audit log) changed while read
+    if r.returncode > 1:
+        err = r.stderr.decode("utf-8", errors="replace").strip()
+        return f"tar exited with status {r.returncode}: {err}"
+    if crc != 0:
+        return f"{os.path.basename(compressor)} exited with status {crc}"
+    return None
+
 
 def create_local_backup(data_dir, dest_path):
     """Create a timestamped tar.gz backup of data_dir.
 
+    Uses the system tar when available and falls back to tarfile.
+
     Args:
         data_dir: Path to directory to back up (e.g. ~/.qvm-remote).
         dest_path: Destination archive path (e.g. /tmp/backup.tar.gz).
     Returns:
         (success: bool, message: str)
     """
-    import tarfile
     data_dir = Path(data_dir)
     if not data_dir.exists():
         return False, f"Data directory not found: {data_dir}"
     try:
         dest_path = Path(dest_path)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
-        with tarfile.open(str(dest_path), "w:gz") as tar:
-            tar.add(str(data_dir), arcname=data_dir.name)
+        tar_bin = which("tar")
+        pigz = which("pigz")
+        compressor = pigz or which("gzip")
+        with open(dest_path, "wb", buffering=BACKUP_BUFFER_SIZE) as out:
+            if tar_bin and compressor:
+                err = _native_backup(tar_bin, compressor, data_dir, out)
+                if err:
+                    return False, f"Backup failed: {err}"
+            elif pigz:
+                # Stream the tar through pigz to compress on all cores.
+                proc = subprocess.Popen([pigz, f"-{BACKUP_GZIP_LEVEL}"],
+                                        stdin=subprocess.PIPE, stdout=out)
+                try:
+                    with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                        tar.add(str(data_dir), arcname=data_dir.name)
+                finally:
+                    proc.stdin.close()
+                    rc = proc.wait()
+                if rc != 0:
+                    return False, f"Backup failed: pigz exited with status {rc}"
+            else:
+                with gzip.GzipFile(fileobj=out, mode="wb", mtime=0,
+                                   compresslevel=BACKUP_GZIP_LEVEL) as gz:
+                    with tarfile.open(fileobj=gz, mode="w|") as tar:
+                        tar.add(str(data_dir), arcname=data_dir.name)
         size = dest_path.stat().st_size
         return True, f"Backup saved to {dest_path} ({format_file_size(size)})"
     except Exception as exc:
@@ -631,8 +922,6 @@ def restore_local_backup(archive_path, restore_dir):
     Returns:
         (success: bool, message: str)
     """
-    import tarfile
-    from datetime import datetime
     archive_path = Path(archive_path)
     restore_dir = Path(restore_dir)
     if not archive_path.exists():
@@ -644,9 +933,14 @@ def restore_local_backup(archive_path, restore_dir):
                 return False, "Archive is empty"
             # Safety: verify no path traversal
             for m in members:
-                if m.startswith("/") or ".." in m:
+                norm = os.path.normpath(m)
+                if norm.startswith("/") or norm == ".." or norm.startswith("../"):
                     return False, f"Unsafe path in archive: {m}"
-            tar.extractall(str(restore_dir))
+            if hasattr(tarfile, "data_filter"):
+                # Also rejects links leaving restore_dir and special files
+                tar.extractall(str(restore_dir), filter="data")
+            else:
+                tar.extractall(str(restore_dir))
         return True, f"Restored from {archive_path} to {restore_dir}"
     except Exception as exc:
         return False, f"Restore failed: {exc}"
@@ -657,24 +951,73 @@ def list_local_backups(backup_dir):
 
     Returns list of (path, size_str, mtime_str) tuples.
     """
-    from datetime import datetime
     backup_dir = Path(backup_dir)
     results = []
     if not backup_dir.exists():
         return results
+    entries = []
     try:
-        for f in sorted(backup_dir.glob("*.tar.gz"), reverse=True):
-            try:
-                st = f.stat()
-                mtime = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
-                results.append((str(f), format_file_size(st.st_size), mtime))
-            except OSError:
-                continue
+        with os.scandir(backup_dir) as it:
+            for e in it:
+                if e.name.startswith(".") or not e.name.endswith(".tar.gz"):
+                    continue
+                try:
+                    if e.is_file():
+                        entries.append((e.path, e.stat()))
+                except OSError:
+                    continue
     except OSError:
         pass
+    entries.sort(key=lambda t: (t[1].st_mtime, t[0]), reverse=True)
+    for path, st in entries:
+        mtime = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+        results.append((path, format_file_size(st.st_size), mtime))
     return results
 
 
+# Audit-log keywords, highest priority first; group number -> event type.
+_EVENT_RE = re.compile(r"(submit)|(key)|(done)|(error|fail)", re.IGNORECASE)
+_EVENT_TYPES = (None, "command", "key", "result", "error")
+
+
+def _classify_log_line(line):
+    """Map an audit-log message to the event type of its top keyword."""
+    best = None
+    for m in _EVENT_RE.finditer(line):
+        if best is None or m.lastindex < best:
+            best = m.lastindex
+            if best == 1:
+                break
+    return _EVENT_TYPES[best] if best else "log"
+
+
+def _tail_lines(path, count, block_size=4096):
+    """Return the last `count` lines of a file, reading backwards in blocks."""
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        pos = os.fstat(fd).st_size
+        blocks, newlines = [], 0
+        # count + 1 newlines guarantee `count` complete lines, even when
+        # the file ends with a newline.
+        while pos > 0 and newlines <= count:
+            step = min(block_size, pos)
+            pos -= step
+            block = os.pread(fd, step, pos)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    return data.decode(errors="replace").splitlines()[-count:]
+
+
+def _read_small(path, default):
+    """Return the contents of a small text file, or default if missing."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return default
+
+
 def get_change_summary(data_dir, max_entries=30):
     """Parse audit log and history for a summary of recent changes.
 
@@ -687,7 +1030,7 @@ def get_change_summary(data_dir, max_entries=30):
     log_file = data_dir / "audit.log"
     if log_file.exists():
         try:
-            for line in log_file.read_text().splitlines()[-max_entries:]:
+            for line in _tail_lines(log_file, max_entries):
                 line = line.strip()
                 if not line:
                     continue
@@ -697,17 +1040,7 @@ def get_change_summary(data_dir, max_entries=30):
                     if end > 0:
                         ts = line[1:end]
                         line = line[end + 1:].strip()
-                event_type = "log"
-                lower = line.lower()
-                if "submit" in lower:
-                    event_type = "command"
-                elif "key" in lower:
-                    event_type = "key"
-                elif "done" in lower:
-                    event_type = "result"
-                elif "error" in lower or "fail" in lower:
-                    event_type = "error"
-                changes.append((ts, event_type, line))
+                changes.append((ts, _classify_log_line(line), line))
         except OSError:
             pass
 
@@ -715,23 +1048,87 @@ def get_change_summary(data_dir, max_entries=30):
     hist_dir = data_dir / "history"
     if hist_dir.exists():
         try:
-            dirs = sorted(hist_dir.glob("*/*"), reverse=True)[:max_entries]
-            for d in dirs:
-                try:
-                    ts = d.parent.name + " " + d.name.split("-")[1] if "-" in d.name else d.name
-                    cmd = ""
-                    if (d / "command").exists():
-                        cmd = (d / "command").read_text().strip()[:80]
-                    rc = (d / "exit").read_text().strip() if (d / "exit").exists() else "?"
-                    changes.append((ts, "history", f"exit={rc} {cmd}"))
-                except OSError:
-                    continue
+            with os.scandir(hist_dir) as it:
+                days = sorted((e for e in it if e.is_dir()),
+                              key=lambda e: e.name, reverse=True)
+            remaining = max_entries
+            for day in days:
+                if remaining <= 0:
+                    break
+                with os.scandir(day.path) as it:
+                    entries = heapq.nlargest(remaining, it, key=lambda e: e.name)
+                remaining -= len(entries)
+                for d in entries:
+                    try:
+                        ts = day.name + " " + d.name.split("-")[1] if "-" in d.name else d.name
+                        cmd = _read_small(os.path.join(d.path, "command"), "").strip()[:80]
+                        rc = _read_small(os.path.join(d.path, "exit"), "?").strip()
+                        changes.append((ts, "history", f"exit={rc} {cmd}"))
+                    except OSError:
+                        continue
         except OSError:
             pass
 
     return changes[-max_entries:]
 
 
+def _newest_entries(directory, count):
+    """Return the last `count` directory entries by name, without a full sort."""
+    with os.scandir(directory) as it:
+        return heapq.nlargest(count, it, key=lambda e: e.name)
+
+
+def _fast_copy(src, dst):
+    """Copy file contents in-kernel: copy_file_range, then sendfile."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        remaining = os.fstat(infd).st_size
+        copy_range = getattr(os, "copy_file_range", None)
+        while remaining > 0:
+            try:
+                if copy_range:
+                    n = copy_range(infd, outfd, remaining)
+                else:
+                    n = os.sendfile(outfd, infd, None, remaining)
+            except OSError:
+                if not copy_range:
+                    raise
+                # e.g. EXDEV on older kernels: continue with sendfile
+                copy_range = None
+                continue
+            if n == 0:
+                break
+            remaining -= n
+
+
+def _copy_files(src_root, dst_root, rel_paths):
+    """Copy rel_paths from src_root to dst_root, skipping missing files.
+
+    Uses a single rsync --files-from call when rsync is installed and
+    falls back to copying file by file.
+    """
+    rsync = which("rsync")
+    if rsync and rel_paths:
+        try:
+            r = subprocess.run(
+                [rsync, "-a", "--ignore-missing-args", "--files-from=-",
+                 f"{src_root}/", f"{dst_root}/"],
+                input="\n".join(rel_paths) + "\n",
+                capture_output=True, text=True, timeout=300,
+            )
+            if r.returncode == 0:
+                return
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    for rel in rel_paths:
+        src = os.path.join(src_root, rel)
+        if os.path.exists(src):
+            dst = os.path.join(dst_root, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _fast_copy(src, dst)
+            shutil.copystat(src, dst)
+
+
 def git_backup_push(data_dir, repo_url, backup_dir=None):
     """Push qvm-remote state to a private git repository.
 
@@ -746,14 +1143,12 @@ def git_backup_push(data_dir, repo_url, backup_dir=None):
     Returns:
         (success: bool, message: str)
     """
-    import shutil
-    from datetime import datetime
     data_dir = Path(data_dir)
     if backup_dir is None:
         backup_dir = data_dir / "git-backup"
     backup_dir = Path(backup_dir)
 
-    git = shutil.which("git")
+    git = which("git")
     if not git:
         return False, "git is not installed. Install git to use repository backups."
 
@@ -795,21 +1190,16 @@ def git_backup_push(data_dir, repo_url, backup_dir=None):
         # Copy history index
         hist_dir = data_dir / "history"
         if hist_dir.exists():
-            hist_out = backup_dir / "history"
-            hist_out.mkdir(exist_ok=True)
             try:
-                for day_dir in sorted(hist_dir.iterdir())[-30:]:
-                    if day_dir.is_dir():
-                        day_out = hist_out / day_dir.name
-                        day_out.mkdir(exist_ok=True)
-                        for cmd_dir in sorted(day_dir.iterdir())[-50:]:
-                            if cmd_dir.is_dir():
-                                cmd_out = day_out / cmd_dir.name
-                                cmd_out.mkdir(exist_ok=True)
-                                for f in ["command", "exit", "meta"]:
-                                    src = cmd_dir / f
-                                    if src.exists():
-                                        shutil.copy2(str(src), str(cmd_out / f))
+                files = [
+                    os.path.join("history", day_dir.name, cmd_dir.name, f)
+                    for day_dir in _newest_entries(hist_dir, 30)
+                    if day_dir.is_dir()
+                    for cmd_dir in _newest_entries(day_dir.path, 50)
+                    if cmd_dir.is_dir()
+                    for f in ("command", "exit", "meta")
+                ]
+                _copy_files(data_dir, backup_dir, files)
             except OSError:
                 pass
 
@@ -849,8 +1239,7 @@ def git_backup_pull(repo_url, backup_dir):
     Returns:
         (success: bool, message: str)
     """
-    import shutil
-    git = shutil.which("git")
+    git = which("git")
     if not git:
         return False, "git is not installed."
     backup_dir = Path(backup_dir)
@@ -12,14 +12,17 @@ qubes-config-manager (marmarta/qubes-config-manager):
 - Active tab: #4180c9 bg, white text
 - Content: #f2f2f2 bg, 100px left/right padding, 50px top
 - Section titles: 150pct size, weight 400; subsections: 700
-- Cards (flowbox_container): white bg, 1px border, 5px radius
+- Cards (qvmcard node): white bg, 1px border, 5px radius
 - Buttons: flat with 1px border, Save = dark-blue bg white text
 - Source Sans Pro font throughout
 """
 
 from __future__ import annotations
 
+import codecs
+import functools
 import os
+import selectors
 import subprocess
 import sys
 import threading
@@ -36,13 +39,11 @@ def _read_version():
         os.path.dirname(os.path.abspath(__file__)),
         "/usr/lib/qvm-remote",
     ]:
-        vf = os.path.join(d, "version")
-        if os.path.isfile(vf):
-            try:
-                with open(vf) as f:
-                    return f.read().strip()
-            except OSError:
-                pass
+        try:
+            with open(os.path.join(d, "version")) as f:
+                return f.read().strip()
+        except OSError:
+            pass
     return "1.1.0"
 
 
@@ -167,9 +168,9 @@ separator {{ background: {sep}; min-height: 1px; }}
     font-weight: 700;
 }}
 
-/* ── Cards (flowbox_container) ── */
+/* ── Cards ── */
 
-.flowbox_container {{
+qvmcard {{
     margin: 10px 30px 10px 30px;
     background: {top-bg};
     padding: 10px;
@@ -193,11 +194,16 @@ separator {{ background: {sep}; min-height: 1px; }}
 
 /* ── Buttons (Global Config flat_button / button_save) ── */
 
+.flat_button, .button_save, .button_cancel, .button_danger {{
+    border-radius: 0;
+    margin: 5px;
+}}
+
+.button_save, .button_cancel, .button_danger {{ padding: 6px 18px; }}
+
 .flat_button {{
     border-color: {mid-gray};
     font-weight: 500;
-    margin: 5px;
-    border-radius: 0;
     color: {text};
 }}
 
@@ -205,9 +211,6 @@ separator {{ background: {sep}; min-height: 1px; }}
     background: {dark-blue};
     color: white;
     font-weight: 600;
-    border-radius: 0;
-    margin: 5px;
-    padding: 6px 18px;
 }}
 
 .button_save:hover {{ background: {qubes-blue}; }}
@@ -215,18 +218,12 @@ separator {{ background: {sep}; min-height: 1px; }}
 .button_cancel {{
     background: {btn-bg};
     color: {btn-text};
-    border-radius: 0;
-    margin: 5px;
-    padding: 6px 18px;
 }}
 
 .button_danger {{
     background: {problem-bg};
     color: {err};
     border: 1px solid {err};
-    border-radius: 0;
-    margin: 5px;
-    padding: 6px 18px;
     font-weight: 600;
 }}
 
@@ -242,7 +239,7 @@ separator {{ background: {sep}; min-height: 1px; }}
 
 /* ── Info / problem boxes ── */
 
-.info_box {{
+qvminfobox {{
     padding: 20px 40px 20px 40px;
     margin: 5px 100px 5px 60px;
     background: {info-bg};
@@ -258,16 +255,14 @@ separator {{ background: {sep}; min-height: 1px; }}
 
 /* ── Permission rows (for VM list etc.) ── */
 
+.permission_list, .permission_row {{ background: {top-bg-2}; }}
+
 .permission_list {{
-    background: {top-bg-2};
     padding-top: 10px;
     padding-bottom: 10px;
 }}
 
-.permission_row {{
-    background: {top-bg-2};
-    padding: 10px;
-}}
+.permission_row {{ padding: 10px; }}
 
 .permission_row:hover {{ background: {qubes-blue}; color: white; }}
 
@@ -331,11 +326,19 @@ entry:focus {{ border-color: {qubes-blue}; }}
 """.format(**COLORS)
 
 
+_CSS_BYTES = _CSS.encode()
+_PROVIDER = None
+
+
 def apply_css():
-    provider = Gtk.CssProvider()
-    provider.load_from_data(_CSS.encode())
+    # Parse the stylesheet once; later calls (more windows) are no-ops
+    global _PROVIDER
+    if _PROVIDER is not None:
+        return
+    _PROVIDER = Gtk.CssProvider()
+    _PROVIDER.load_from_data(_CSS_BYTES)
     Gtk.StyleContext.add_provider_for_screen(
-        Gdk.Screen.get_default(), provider,
+        Gdk.Screen.get_default(), _PROVIDER,
         Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
 
 
@@ -351,10 +354,11 @@ def check_display():
 
 
 def label(text, css=None, wrap=True, sel=False, xa=0, tip=None):
-    lbl = Gtk.Label(label=text, xalign=xa)
-    lbl.set_line_wrap(wrap)
-    lbl.set_line_wrap_mode(Pango.WrapMode.WORD_CHAR)
-    lbl.set_selectable(sel)
+    # Construct-time properties; only non-default values are passed
+    kw = {"wrap": True, "wrap_mode": Pango.WrapMode.WORD_CHAR} if wrap else {}
+    if sel:
+        kw["selectable"] = True
+    lbl = Gtk.Label(label=text, xalign=xa, **kw)
     if css:
         lbl.get_style_context().add_class(css)
     if tip:
@@ -375,9 +379,22 @@ def group_title(text, tip=None):
     return label(text, "group_title", tip=tip)
 
 
+# Single-purpose containers get their own CSS node name, so the
+# stylesheet matches them by name rather than by style class.
+class _Card(Gtk.Box):
+    __gtype_name__ = "QvmCard"
+
+
+class _InfoBox(Gtk.Box):
+    __gtype_name__ = "QvmInfoBox"
+
+
+_Card.set_css_name("qvmcard")
+_InfoBox.set_css_name("qvminfobox")
+
+
 def card(title=None, tip=None):
-    c = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-    c.get_style_context().add_class("flowbox_container")
+    c = _Card(orientation=Gtk.Orientation.VERTICAL, spacing=8)
     if title:
         c.pack_start(label(title, "flowbox_title"), False, False, 0)
     if tip:
@@ -411,8 +428,7 @@ def entry(ph="", text="", tip=None):
 
 
 def info_box(text, tip=None):
-    b = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
-    b.get_style_context().add_class("info_box")
+    b = _InfoBox(orientation=Gtk.Orientation.VERTICAL, spacing=4)
     b.pack_start(label(text), False, False, 0)
     if tip:
         b.set_tooltip_text(tip)
@@ -439,31 +455,42 @@ def scrolled(child, h=200):
 
 
 class StatusDot(Gtk.Box):
+    _STATE_CLASS = {"ok": "status-ok", "warn": "status-warn",
+                    "error": "status-error"}
+
     def __init__(self, text="Unknown", state="unknown", tip=None):
         super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         self._dot = Gtk.Label(label="\u25cf")
         self._dot.get_style_context().add_class("status-dot")
         self._lbl = Gtk.Label(label=text)
+        self._cur_class = ""
+        self._cur_text = text
+        self.set_state(state)
         self.pack_start(self._dot, False, False, 0)
         self.pack_start(self._lbl, False, False, 0)
-        self.set_state(state, text)
         if tip:
             self.set_tooltip_text(tip)
 
     def set_state(self, state, text=None):
-        ctx = self._dot.get_style_context()
-        for c in ("status-ok", "status-warn", "status-error"):
-            ctx.remove_class(c)
-        ctx.add_class({"ok": "status-ok", "warn": "status-warn",
-                        "error": "status-error"}.get(state, ""))
-        if text is not None:
+        cls = self._STATE_CLASS.get(state, "")
+        if cls != self._cur_class:
+            ctx = self._dot.get_style_context()
+            if self._cur_class:
+                ctx.remove_class(self._cur_class)
+            if cls:
+                ctx.add_class(cls)
+            self._cur_class = cls
+        if text is not None and text != self._cur_text:
             self._lbl.set_text(text)
+            self._cur_text = text
 
 
 # ── Output view ──────────────────────────────────────────────────
 
 
 class OutputView(Gtk.ScrolledWindow):
+    MAX_CHARS = 2 * 1024 * 1024  # older output is dropped, whole lines at a time
+
     def __init__(self, height=200):
         super().__init__()
         self.set_min_content_height(height)
@@ -478,17 +505,47 @@ class OutputView(Gtk.ScrolledWindow):
         self._tv.set_bottom_margin(6)
         self._tv.get_style_context().add_class("output_view")
         self.add(self._tv)
+        self._scroll_pending = False
 
     def clear(self):
         self._buf.set_text("")
 
     def append(self, t):
-        self._buf.insert(self._buf.get_end_iter(), t)
         adj = self.get_vadjustment()
-        adj.set_value(adj.get_upper())
+        # Only follow the output if the user has not scrolled up
+        follow = adj.get_value() + adj.get_page_size() >= adj.get_upper() - 4
+        self._buf.insert(self._buf.get_end_iter(), t)
+        excess = self._buf.get_char_count() - self.MAX_CHARS
+        if excess > 0:
+            cut = self._buf.get_iter_at_offset(excess)
+            cut.forward_line()
+            self._buf.delete(self._buf.get_start_iter(), cut)
+        if follow:
+            self._queue_scroll()
 
     def set_text(self, t):
-        self._buf.set_text(t)
+        if len(t) > self.MAX_CHARS:
+            cut = t.find("\n", len(t) - self.MAX_CHARS)
+            t = t[cut + 1:] if cut >= 0 else t[-self.MAX_CHARS:]
+        self._buf.freeze_notify()
+        try:
+            self._buf.set_text(t)
+        finally:
+            self._buf.thaw_notify()
+        self._queue_scroll()
+
+    def _queue_scroll(self):
+        # Scroll once the view has laid out the new text (its validation
+        # idle runs before default-priority idles), not on every insert
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            GLib.idle_add(self._scroll_to_end)
+
+    def _scroll_to_end(self):
+        self._scroll_pending = False
+        adj = self.get_vadjustment()
+        adj.set_value(adj.get_upper() - adj.get_page_size())
+        return False
 
     def get_text(self):
         return self._buf.get_text(self._buf.get_start_iter(), self._buf.get_end_iter(), True)
@@ -509,68 +566,176 @@ def run_cmd(cmd, timeout=30):
         return 1, "", str(e)
 
 
+class _PipeReactor:
+    """One background thread that reads the output pipes of every AsyncRunner."""
+
+    def __init__(self):
+        self._sel = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._ops = []
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ)
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    # cb(chunk) runs on the reactor thread; b"" means EOF or unwatched,
+    # after which the fd is no longer registered and may be closed.
+    def watch(self, fd, cb):
+        self._post(True, fd, cb)
+
+    def unwatch(self, fd, cb):
+        self._post(False, fd, cb)
+
+    def _post(self, add, fd, cb):
+        with self._lock:
+            self._ops.append((add, fd, cb))
+        os.write(self._wake_w, b"\0")
+
+    def _apply_ops(self):
+        try:
+            os.read(self._wake_r, 4096)
+        except BlockingIOError:
+            pass
+        with self._lock:
+            ops, self._ops = self._ops, []
+        for add, fd, cb in ops:
+            if add:
+                try:
+                    self._sel.register(fd, selectors.EVENT_READ, cb)
+                except (OSError, ValueError, KeyError):
+                    self._call(cb, b"")
+                continue
+            key = self._sel.get_map().get(fd)
+            if key is not None and key.data is cb:
+                self._sel.unregister(fd)
+                self._call(cb, b"")
+
+    @staticmethod
+    def _call(cb, chunk):
+        try:
+            cb(chunk)
+        except Exception:
+            pass
+
+    def _loop(self):
+        while True:
+            for key, _ in self._sel.select():
+                if key.fd == self._wake_r:
+                    self._apply_ops()
+                    continue
+                if self._sel.get_map().get(key.fd) is not key:
+                    continue  # unwatched earlier in this batch
+                try:
+                    chunk = os.read(key.fd, 65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    self._sel.unregister(key.fd)
+                self._call(key.data, chunk)
+
+
+@functools.lru_cache(maxsize=1)
+def _pipe_reactor():
+    return _PipeReactor()
+
+
 class AsyncRunner:
+    FLUSH_MS = 50  # output arriving within this window becomes one append
+
     def __init__(self, ov, on_done=None):
         self._ov = ov
         self._on_done = on_done
         self._proc = None
+        self._watch = None
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flush_scheduled = False
 
     def run(self, cmd, clear=True):
         if clear:
             self._ov.clear()
-        threading.Thread(target=self._work, args=(cmd,), daemon=True).start()
-
-    def _work(self, cmd):
         try:
-            self._proc = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=True, bufsize=1)
-            for line in self._proc.stdout:
-                GLib.idle_add(self._ov.append, line)
-            self._proc.wait()
-            rc = self._proc.returncode
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         except Exception as e:
-            rc = 1
             GLib.idle_add(self._ov.append, "\nError: " + str(e) + "\n")
-        finally:
-            self._proc = None
+            if self._on_done:
+                GLib.idle_add(self._on_done, 1)
+            return
+        dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        def on_data(chunk):
+            text = dec.decode(chunk, final=not chunk)
+            if text:
+                self._queue(text)
+            if not chunk:
+                proc.stdout.close()
+                GLib.idle_add(self._reap, proc)
+
+        self._proc = proc
+        self._watch = (proc.stdout.fileno(), on_data)
+        _pipe_reactor().watch(*self._watch)
+
+    def _queue(self, text):
+        with self._lock:
+            self._pending.append(text)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        # Cosmetic: let input and redraws win over output appends
+        GLib.timeout_add(self.FLUSH_MS, self._flush, priority=GLib.PRIORITY_LOW)
+
+    def _flush(self):
+        with self._lock:
+            text = "".join(self._pending)
+            self._pending.clear()
+            self._flush_scheduled = False
+        if text:
+            self._ov.append(text)
+        return False
+
+    def _reap(self, proc):
+        # Output is done; the process may still take a moment to exit
+        rc = proc.poll()
+        if rc is None:
+            GLib.timeout_add(100, self._reap, proc)
+            return False
+        self._flush()
+        if self._proc is proc:
+            self._proc = self._watch = None
         if self._on_done:
-            GLib.idle_add(self._on_done, rc)
+            self._on_done(rc)
+        return False
 
     def cancel(self):
         if self._proc:
             self._proc.terminate()
+            _pipe_reactor().unwatch(*self._watch)
 
 
 # ── Dialogs ──────────────────────────────────────────────────────
 
 
-def confirm(parent, title, msg):
+def _message(parent, kind, buttons, title, msg):
     d = Gtk.MessageDialog(transient_for=parent, modal=True,
-                          message_type=Gtk.MessageType.QUESTION,
-                          buttons=Gtk.ButtonsType.YES_NO, text=title)
+                          message_type=kind, buttons=buttons, text=title)
     d.format_secondary_text(msg)
     r = d.run()
     d.destroy()
-    return r == Gtk.ResponseType.YES
+    return r
+
+
+def confirm(parent, title, msg):
+    return _message(parent, Gtk.MessageType.QUESTION, Gtk.ButtonsType.YES_NO,
+                    title, msg) == Gtk.ResponseType.YES
 
 
 def show_info(parent, title, msg):
-    d = Gtk.MessageDialog(transient_for=parent, modal=True,
-                          message_type=Gtk.MessageType.INFO,
-                          buttons=Gtk.ButtonsType.OK, text=title)
-    d.format_secondary_text(msg)
-    d.run()
-    d.destroy()
+    _message(parent, Gtk.MessageType.INFO, Gtk.ButtonsType.OK, title, msg)
 
 
 def show_error(parent, title, msg):
-    d = Gtk.MessageDialog(transient_for=parent, modal=True,
-                          message_type=Gtk.MessageType.ERROR,
-                          buttons=Gtk.ButtonsType.OK, text=title)
-    d.format_secondary_text(msg)
-    d.run()
-    d.destroy()
+    _message(parent, Gtk.MessageType.ERROR, Gtk.ButtonsType.OK, title, msg)
 
 
 # ── Notification ─────────────────────────────────────────────────
@@ -597,36 +762,106 @@ def notify(title, body="", icon=ICON_INFO):
 # ── Validation ───────────────────────────────────────────────────
 
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
 def valid_hex_key(key):
-    if len(key) != 64:
-        return False
-    try:
-        int(key, 16)
-        return True
-    except ValueError:
-        return False
+    return len(key) == 64 and _HEX_DIGITS.issuperset(key)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 
 def fmt_size(n):
-    for u in ("B", "KB", "MB", "GB"):
-        if abs(n) < 1024.0:
-            return ("{} B".format(int(n))) if u == "B" else ("{:.1f} {}".format(n, u))
-        n /= 1024.0
-    return "{:.1f} TB".format(n)
+    # floor(log1024(n)) from the bit length, capped at TB
+    exp = min(4, max(0, (int(abs(n)).bit_length() - 1) // 10))
+    if exp == 0:
+        return "{} B".format(int(n))
+    return "{:.1f} {}".format(n / (1 << (10 * exp)), _SIZE_UNITS[exp])
 
 
 # ── Backup helpers ───────────────────────────────────────────────
 
 
+# Same level as the gui backups: fast, and the state is mostly small text
+BACKUP_GZIP_LEVEL = 1
+
+
+def _tar_gz(tar_bin, gz_bin, data_dir, dest):
+    # tar | pigz (all cores) or gzip, both native; raises on failure
+    with open(str(dest), "wb") as out:
+        gz = subprocess.Popen([gz_bin, "-{}".format(BACKUP_GZIP_LEVEL)],
+                              stdin=subprocess.PIPE, stdout=out)
+        try:
+            r = subprocess.run([tar_bin, "-cf", "-", "-C", str(data_dir.parent), data_dir.name],
+                               stdout=gz.stdin, stderr=subprocess.PIPE)
+        finally:
+            gz.stdin.close()
+            gz_rc = gz.wait()
+    # GNU tar exits 1 when a file (e.g. a log) changed while being read
+    if r.returncode > 1:
+        raise RuntimeError("tar: " + r.stderr.decode(errors="replace").strip())
+    if gz_rc != 0:
+        raise RuntimeError("{} exited with status {}".format(os.path.basename(gz_bin), gz_rc))
+
+
+def _walk_scandir(root):
+    # Yields DirEntry objects below root, each directory before its contents
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                yield e
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+
+
+def _tar_add_tree(tar, root, arcname):
+    # Like tar.add(root, arcname) but reuses the scandir stat results
+    # instead of an lstat and owner-name lookup per entry
+    import tarfile
+
+    def info(name, st, kind):
+        ti = tarfile.TarInfo(name)
+        ti.type = kind
+        ti.mode = st.st_mode & 0o7777
+        ti.mtime = int(st.st_mtime)
+        ti.uid, ti.gid = st.st_uid, st.st_gid
+        return ti
+
+    tar.addfile(info(arcname, os.lstat(root), tarfile.DIRTYPE))
+    base = len(root) + 1
+    for e in _walk_scandir(root):
+        st = e.stat(follow_symlinks=False)
+        name = arcname + "/" + e.path[base:]
+        if e.is_dir(follow_symlinks=False):
+            tar.addfile(info(name, st, tarfile.DIRTYPE))
+        elif e.is_symlink():
+            ti = info(name, st, tarfile.SYMTYPE)
+            ti.linkname = os.readlink(e.path)
+            tar.addfile(ti)
+        elif e.is_file(follow_symlinks=False):
+            ti = info(name, st, tarfile.REGTYPE)
+            ti.size = st.st_size
+            with open(e.path, "rb") as f:
+                tar.addfile(ti, f)
+
+
 def backup_create(data_dir, dest):
+    import shutil
     import tarfile
     data_dir, dest = Path(data_dir), Path(dest)
     if not data_dir.exists():
         return False, "Data directory not found: " + str(data_dir)
     try:
         dest.parent.mkdir(parents=True, exist_ok=True)
-        with tarfile.open(str(dest), "w:gz") as tar:
-            tar.add(str(data_dir), arcname=data_dir.name)
+        tar_bin = shutil.which("tar")
+        gz_bin = shutil.which("pigz") or shutil.which("gzip")
+        if tar_bin and gz_bin:
+            _tar_gz(tar_bin, gz_bin, data_dir, dest)
+        else:
+            with tarfile.open(str(dest), "w:gz", compresslevel=BACKUP_GZIP_LEVEL) as tar:
+                _tar_add_tree(tar, str(data_dir), data_dir.name)
         return True, "Backup saved to {} ({})".format(dest, fmt_size(dest.stat().st_size))
     except Exception as e:
         return False, "Backup failed: " + str(e)
@@ -637,13 +872,24 @@ def backup_restore(archive, restore_dir):
     archive, restore_dir = Path(archive), Path(restore_dir)
     if not archive.exists():
         return False, "Archive not found: " + str(archive)
+
+    # Check every member, links included, before anything is written
+    data_filter = getattr(tarfile, "data_filter", None)
+    dest = str(restore_dir)
     try:
         with tarfile.open(str(archive), "r:gz") as tar:
-            for m in tar.getnames():
-                if m.startswith("/") or ".." in m:
-                    return False, "Unsafe path: " + m
-            tar.extractall(str(restore_dir))
-        return True, "Restored to " + str(restore_dir)
+            members = tar.getmembers()
+            for m in members:
+                if m.name.startswith("/") or ".." in m.name.split("/"):
+                    return False, "Unsafe path: " + m.name
+                if data_filter:
+                    try:
+                        data_filter(m, dest)
+                    except tarfile.FilterError:
+                        return False, "Unsafe path: " + m.name
+            kw = {"filter": "data"} if data_filter else {}
+            tar.extractall(dest, members=members, **kw)
+        return True, "Restored to " + dest
     except Exception as e:
         return False, "Restore failed: " + str(e)
 
@@ -653,18 +899,44 @@ def backup_list(bak_dir):
     bak_dir = Path(bak_dir)
     if not bak_dir.exists():
         return []
-    results = []
+    entries = []
     try:
-        for f in sorted(bak_dir.glob("*.tar.gz"), reverse=True):
-            try:
-                st = f.stat()
-                results.append((str(f), fmt_size(st.st_size),
-                                dt.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")))
-            except OSError:
-                pass
+        with os.scandir(bak_dir) as it:
+            for e in it:
+                if not e.name.endswith(".tar.gz"):
+                    continue
+                try:
+                    if e.is_file():
+                        entries.append((e.stat(), e.path))
+                except OSError:
+                    pass
     except OSError:
         pass
-    return results
+    # Newest first; names are timestamped so ties keep the old name order
+    entries.sort(key=lambda t: (t[0].st_mtime, t[1]), reverse=True)
+    return [(p, fmt_size(st.st_size), dt.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M"))
+            for st, p in entries]
+
+
+_GIT_BIN = None
+
+
+def _git_bin():
+    # Remember git once found; a miss is looked up again on the next call
+    global _GIT_BIN
+    if _GIT_BIN is None:
+        import shutil
+        _GIT_BIN = shutil.which("git")
+    return _GIT_BIN
+
+
+def _git(git, cwd, *args, timeout=30, text=False):
+    # Never prompt for credentials, never take optional index locks,
+    # and never fork a background gc from a backup run
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+    return subprocess.run([git, "-c", "gc.auto=0", "-c", "core.fsmonitor=false"] + list(args),
+                          cwd=str(cwd) if cwd else None, env=env,
+                          capture_output=True, text=text, timeout=timeout)
 
 
 def git_push(data_dir, repo_url, backup_dir=None):
@@ -672,60 +944,70 @@ def git_push(data_dir, repo_url, backup_dir=None):
     from datetime import datetime as dt
     data_dir = Path(data_dir)
     backup_dir = Path(backup_dir) if backup_dir else data_dir / "git-backup"
-    git = shutil.which("git")
+    git = _git_bin()
     if not git:
         return False, "git not installed"
     try:
         backup_dir.mkdir(parents=True, exist_ok=True)
         if not (backup_dir / ".git").exists():
-            subprocess.run([git, "init"], cwd=str(backup_dir), capture_output=True, timeout=30)
-            subprocess.run([git, "remote", "add", "origin", repo_url],
-                           cwd=str(backup_dir), capture_output=True, timeout=10)
+            _git(git, backup_dir, "init")
+            _git(git, backup_dir, "remote", "add", "origin", repo_url, timeout=10)
         else:
-            subprocess.run([git, "remote", "set-url", "origin", repo_url],
-                           cwd=str(backup_dir), capture_output=True, timeout=10)
+            _git(git, backup_dir, "remote", "set-url", "origin", repo_url, timeout=10)
         audit = data_dir / "audit.log"
         if audit.exists():
-            shutil.copy2(str(audit), str(backup_dir / "audit.log"))
+            # copy2 keeps the mtime, so an unchanged log has the same size/mtime
+            st, dst = audit.stat(), backup_dir / "audit.log"
+            try:
+                dst_st = dst.stat()
+                same = (dst_st.st_size, dst_st.st_mtime_ns) == (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                same = False
+            if not same:
+                shutil.copy2(str(audit), str(dst))
         key_file = data_dir / "auth.key"
         if key_file.exists():
             try:
                 k = key_file.read_text().strip()
                 fp = k[:8] + "..." + k[-8:] if len(k) >= 16 else "***"
-                (backup_dir / "key-fingerprint.txt").write_text(
-                    "Key fingerprint: {}\nLength: {}\nDate: {}\n".format(
-                        fp, len(k), dt.now().isoformat()))
+                head = "Key fingerprint: {}\nLength: {}\n".format(fp, len(k))
+                fp_file = backup_dir / "key-fingerprint.txt"
+                # Only rewrite it (and its date) when the key itself changed
+                if not (fp_file.exists() and fp_file.read_text().startswith(head)):
+                    fp_file.write_text(head + "Date: {}\n".format(dt.now().isoformat()))
             except OSError:
                 pass
-        (backup_dir / "backup-meta.txt").write_text(
-            "qvm-remote backup\ndate: {}\nversion: {}\n".format(
-                dt.now().isoformat(), UI_VERSION))
-        subprocess.run([git, "add", "-A"], cwd=str(backup_dir), capture_output=True, timeout=30)
-        subprocess.run([git, "commit", "-m", "Backup " + dt.now().strftime("%Y-%m-%d %H:%M:%S"),
-                         "--allow-empty"], cwd=str(backup_dir), capture_output=True, timeout=30)
-        r = subprocess.run([git, "push", "-u", "origin", "HEAD"],
-                           cwd=str(backup_dir), capture_output=True, text=True, timeout=60)
+        # Skip add/commit when the backed-up data is unchanged since the last commit
+        status = _git(git, backup_dir, "status", "--porcelain", "-z")
+        has_head = _git(git, backup_dir, "rev-parse", "--verify", "-q", "HEAD").returncode == 0
+        changed = status.returncode != 0 or bool(status.stdout) or not has_head
+        if changed:
+            (backup_dir / "backup-meta.txt").write_text(
+                "qvm-remote backup\ndate: {}\nversion: {}\n".format(
+                    dt.now().isoformat(), UI_VERSION))
+            _git(git, backup_dir, "add", "-A")
+            _git(git, backup_dir, "commit", "--no-verify", "--allow-empty",
+                 "-m", "Backup " + dt.now().strftime("%Y-%m-%d %H:%M:%S"))
+        r = _git(git, backup_dir, "push", "--no-verify", "-u", "origin", "HEAD",
+                 timeout=60, text=True)
         if r.returncode != 0:
             return False, "Push failed: " + r.stderr.strip()
-        return True, "Backed up to " + repo_url
+        return True, "Backed up to " + repo_url + ("" if changed else " (no changes)")
     except Exception as e:
         return False, "Git backup failed: " + str(e)
 
 
 def git_pull(repo_url, backup_dir):
-    import shutil
-    git = shutil.which("git")
+    git = _git_bin()
     if not git:
         return False, "git not installed"
     backup_dir = Path(backup_dir)
     try:
         if (backup_dir / ".git").exists():
-            r = subprocess.run([git, "pull", "--ff-only"], cwd=str(backup_dir),
-                               capture_output=True, text=True, timeout=60)
+            r = _git(git, backup_dir, "pull", "--ff-only", timeout=60, text=True)
         else:
             backup_dir.mkdir(parents=True, exist_ok=True)
-            r = subprocess.run([git, "clone", repo_url, str(backup_dir)],
-                               capture_output=True, text=True, timeout=120)
+            r = _git(git, None, "clone", repo_url, str(backup_dir), timeout=120, text=True)
         if r.returncode != 0:
             return False, "Pull failed: " + r.stderr.strip()
         return True, "Pulled from " + repo_url
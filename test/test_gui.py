@@ -6,110 +6,143 @@ helper functions, packaging, and Makefile integration -- all without
 requiring a running display server (headless-safe).
 """
 
+import functools
 import os
+import re
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 REPO = Path(__file__).resolve().parent.parent
 GUI_DIR = REPO / "gui"
+CLIENT_GUI = GUI_DIR / "qvm-remote-gui"
+DOM0_GUI = GUI_DIR / "qvm-remote-dom0-gui"
+GUI_SCRIPTS = (CLIENT_GUI, DOM0_GUI)
+MAKEFILE = REPO / "Makefile"
 
 # Ensure the gui directory is on the path for imports
 sys.path.insert(0, str(GUI_DIR))
 
+import qubes_remote_ui as qru  # noqa: E402
+
+
+_HEX_COLOR = re.compile(r"#[0-9A-Fa-f]{6}")
+
+
+@functools.lru_cache(maxsize=None)
+def _read(path):
+    """Read a repo file once; the sources do not change during a run."""
+    return Path(path).read_text()
+
+
+@functools.lru_cache(maxsize=None)
+def _tokens_present(path, tokens):
+    """Return the subset of tokens (a tuple) found in the file at path."""
+    text = _read(path)
+    return frozenset(t for t in tokens if t in text)
+
 
 class TestSharedModule(unittest.TestCase):
     """Tests for gui/qubes_remote_ui.py."""
 
     def test_import(self):
         """Shared module can be imported."""
-        import qubes_remote_ui
-        self.assertTrue(hasattr(qubes_remote_ui, "UI_VERSION"))
+        self.assertTrue(hasattr(qru, "UI_VERSION"))
+
+    def test_widgets_need_gtk(self):
+        """Widget classes are defined exactly when PyGObject is available."""
+        for name in ("StatusIndicator", "OutputView"):
+            self.assertEqual(hasattr(qru, name), qru.Gtk is not None, name)
 
     def test_version(self):
         """UI version matches the repo version file."""
-        import qubes_remote_ui
         version_file = REPO / "version"
         if version_file.exists():
             expected = version_file.read_text().strip()
-            self.assertEqual(qubes_remote_ui.UI_VERSION, expected)
+            self.assertEqual(qru.UI_VERSION, expected)
 
     def test_color_constants(self):
         """Color constants are defined and valid hex."""
-        import qubes_remote_ui
-        self.assertIn("blue_primary", qubes_remote_ui.QUBES_COLORS)
-        self.assertIn("red_danger", qubes_remote_ui.QUBES_COLORS)
-        for name, color in qubes_remote_ui.QUBES_COLORS.items():
-            self.assertTrue(
-                color.startswith("#"),
-                f"Color {name} does not start with #: {color}",
-            )
-            self.assertEqual(
-                len(color), 7,
-                f"Color {name} is not #RRGGBB format: {color}",
-            )
+        self.assertIn("blue_primary", qru.QUBES_COLORS)
+        self.assertIn("red_danger", qru.QUBES_COLORS)
+        bad = {name: color for name, color in qru.QUBES_COLORS.items()
+               if not _HEX_COLOR.fullmatch(color)}
+        self.assertEqual(bad, {}, "Colors not in #RRGGBB format")
 
     def test_label_colors(self):
         """All 8 Qubes label colors are defined."""
-        import qubes_remote_ui
         expected = {"red", "orange", "yellow", "green", "gray", "blue", "purple", "black"}
-        self.assertEqual(set(qubes_remote_ui.LABEL_COLORS.keys()), expected)
+        self.assertEqual(set(qru.LABEL_COLORS.keys()), expected)
 
     def test_css_string(self):
         """CSS template is a non-empty string."""
-        import qubes_remote_ui
-        self.assertIsInstance(qubes_remote_ui.QUBES_CSS, str)
-        self.assertGreater(len(qubes_remote_ui.QUBES_CSS), 100)
+        self.assertIsInstance(qru.QUBES_CSS, str)
+        self.assertGreater(len(qru.QUBES_CSS), 100)
 
     def test_run_quick_not_found(self):
         """run_quick returns 127 for non-existent commands."""
-        import qubes_remote_ui
-        rc, out, err = qubes_remote_ui.run_quick(
+        rc, out, err = qru.run_quick(
             ["__nonexistent_command_12345__"]
         )
         self.assertEqual(rc, 127)
         self.assertIn("not found", err.lower())
 
-    def test_run_quick_true(self):
-        """run_quick succeeds for 'true'."""
-        import qubes_remote_ui
-        rc, out, err = qubes_remote_ui.run_quick(["true"])
-        self.assertEqual(rc, 0)
-
-    def test_run_quick_false(self):
-        """run_quick returns non-zero for 'false'."""
-        import qubes_remote_ui
-        rc, out, err = qubes_remote_ui.run_quick(["false"])
-        self.assertNotEqual(rc, 0)
-
-    def test_run_quick_echo(self):
-        """run_quick captures stdout."""
-        import qubes_remote_ui
-        rc, out, err = qubes_remote_ui.run_quick(["echo", "hello world"])
-        self.assertEqual(rc, 0)
-        self.assertEqual(out.strip(), "hello world")
+    def test_run_quick_basic(self):
+        """run_quick reports exit status and captures stdout."""
+        with self.subTest(cmd="true"):
+            rc, out, err = qru.run_quick(["true"])
+            self.assertEqual(rc, 0)
+        with self.subTest(cmd="false"):
+            rc, out, err = qru.run_quick(["false"])
+            self.assertNotEqual(rc, 0)
+        with self.subTest(cmd="echo"):
+            rc, out, err = qru.run_quick(["echo", "hello world"])
+            self.assertEqual(rc, 0)
+            self.assertEqual(out.strip(), "hello world")
 
     def test_find_executable(self):
         """find_executable locates system binaries."""
-        import qubes_remote_ui
-        result = qubes_remote_ui.find_executable("python3")
+        result = qru.find_executable("python3")
         self.assertIsNotNone(result)
         self.assertTrue(os.path.isfile(result))
 
+    def test_find_executable_cache_clear(self):
+        """Misses are not cached; cache_clear forgets removed tools."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(
+                qru.find_executable("qvm-fake-tool", [tmp]))
+            tool = Path(tmp) / "qvm-fake-tool"
+            tool.write_text("#!/bin/sh\n")
+            tool.chmod(0o755)
+            self.assertEqual(
+                qru.find_executable("qvm-fake-tool", [tmp]),
+                str(tool))
+            tool.unlink()
+            self.assertEqual(
+                qru.find_executable("qvm-fake-tool", [tmp]),
+                str(tool))
+            qru.find_executable.cache_clear()
+            self.assertIsNone(
+                qru.find_executable("qvm-fake-tool", [tmp]))
+
 
 class TestSharedNotifications(unittest.TestCase):
     """Tests for notification and file transfer helpers."""
 
+    HEX_VALID_A = "a" * 64
+    HEX_VALID_MIX = "0123456789abcdef" * 4
+    HEX_SHORT = "a" * 63
+    HEX_BAD = "g" * 64
+
     def test_send_notification_exists(self):
         """send_notification function is available."""
-        import qubes_remote_ui
-        self.assertTrue(hasattr(qubes_remote_ui, "send_notification"))
-        self.assertTrue(callable(qubes_remote_ui.send_notification))
+        self.assertTrue(hasattr(qru, "send_notification"))
+        self.assertTrue(callable(qru.send_notification))
 
     def test_notification_icons_defined(self):
         """All notification icon constants are defined."""
-        import qubes_remote_ui
         for icon in [
             "NOTIFY_ICON_INFO", "NOTIFY_ICON_SUCCESS",
             "NOTIFY_ICON_WARNING", "NOTIFY_ICON_ERROR",
@@ -117,80 +150,88 @@ class TestSharedNotifications(unittest.TestCase):
             "NOTIFY_ICON_TRANSFER",
         ]:
             self.assertTrue(
-                hasattr(qubes_remote_ui, icon),
+                hasattr(qru, icon),
                 f"Missing icon constant: {icon}",
             )
-            val = getattr(qubes_remote_ui, icon)
+            val = getattr(qru, icon)
             self.assertIsInstance(val, str)
             self.assertTrue(len(val) > 0)
 
     def test_format_file_size(self):
         """format_file_size returns human-readable sizes."""
-        import qubes_remote_ui
-        self.assertEqual(qubes_remote_ui.format_file_size(0), "0 B")
-        self.assertEqual(qubes_remote_ui.format_file_size(1023), "1023 B")
-        self.assertIn("KB", qubes_remote_ui.format_file_size(1024))
-        self.assertIn("MB", qubes_remote_ui.format_file_size(1024 * 1024))
-        self.assertIn("GB", qubes_remote_ui.format_file_size(1024 ** 3))
+        cases = [(0, "0 B"), (1023, "1023 B"), (1024, "1.0 KB"),
+                 (1024 ** 2, "1.0 MB"), (1024 ** 3, "1.0 GB")]
+        for size, expected in cases:
+            with self.subTest(size=size):
+                self.assertEqual(qru.format_file_size(size), expected)
 
     def test_valid_hex_key(self):
         """valid_hex_key validates correctly."""
-        import qubes_remote_ui
-        self.assertTrue(qubes_remote_ui.valid_hex_key("a" * 64))
-        self.assertTrue(qubes_remote_ui.valid_hex_key("0123456789abcdef" * 4))
-        self.assertFalse(qubes_remote_ui.valid_hex_key("a" * 63))
-        self.assertFalse(qubes_remote_ui.valid_hex_key("g" * 64))
-        self.assertFalse(qubes_remote_ui.valid_hex_key(""))
+        self.assertTrue(qru.valid_hex_key(self.HEX_VALID_A))
+        self.assertTrue(qru.valid_hex_key(self.HEX_VALID_MIX))
+        self.assertFalse(qru.valid_hex_key(self.HEX_SHORT))
+        self.assertFalse(qru.valid_hex_key(self.HEX_BAD))
+        self.assertFalse(qru.valid_hex_key(""))
+
+    def test_valid_hex_key_rejects_int_syntax(self):
+        """valid_hex_key rejects prefixes, signs and separators int() allows."""
+        for key in ["0x" + "a" * 62, "+" + "a" * 63, " " + "a" * 63,
+                    "a_" * 32]:
+            self.assertFalse(qru.valid_hex_key(key), repr(key))
 
     def test_check_display_function(self):
         """check_display returns string or None."""
-        import qubes_remote_ui
-        result = qubes_remote_ui.check_display()
+        result = qru.check_display()
         self.assertTrue(result is None or isinstance(result, str))
 
     def test_send_notification_no_crash(self):
         """send_notification does not crash even without notify-send."""
-        import qubes_remote_ui
         # Should silently do nothing if notify-send is missing
-        qubes_remote_ui.send_notification("test", "body")
+        qru.send_notification("test", "body")
 
     def test_backup_icon_defined(self):
         """Backup notification icon is defined."""
-        import qubes_remote_ui
-        self.assertTrue(hasattr(qubes_remote_ui, "NOTIFY_ICON_BACKUP"))
-        self.assertIsInstance(qubes_remote_ui.NOTIFY_ICON_BACKUP, str)
-        self.assertTrue(len(qubes_remote_ui.NOTIFY_ICON_BACKUP) > 0)
+        self.assertTrue(hasattr(qru, "NOTIFY_ICON_BACKUP"))
+        self.assertIsInstance(qru.NOTIFY_ICON_BACKUP, str)
+        self.assertTrue(len(qru.NOTIFY_ICON_BACKUP) > 0)
 
 
 class TestBackupHelpers(unittest.TestCase):
     """Tests for backup and change tracking helpers."""
 
+    @classmethod
+    def setUpClass(cls):
+        # One temp tree for the class; each test gets its own subdirectory
+        cls.root = tempfile.mkdtemp(prefix="qvm-remote-backup-test-")
+        # One sample archive, shared by the create and restore tests
+        sample = Path(cls.root) / "sample" / ".qvm-remote"
+        sample.mkdir(parents=True)
+        (sample / "audit.log").write_text("test log entry\n")
+        (sample / "auth.key").write_text("a" * 64)
+        cls.sample_archive = str(Path(cls.root) / "sample" / "backups" / "test-backup.tar.gz")
+        cls.sample_result = qru.create_local_backup(sample, cls.sample_archive)
+
+    @classmethod
+    def tearDownClass(cls):
+        import shutil
+        shutil.rmtree(cls.root, ignore_errors=True)
+
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp(prefix="qvm-remote-backup-test-")
+        self.tmpdir = os.path.join(self.root, self._testMethodName)
+        os.mkdir(self.tmpdir)
         self.data_dir = Path(self.tmpdir) / ".qvm-remote"
         self.backup_dir = Path(self.tmpdir) / "backups"
 
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
-
     def test_create_local_backup(self):
         """create_local_backup creates a tar.gz archive."""
-        import qubes_remote_ui
-        self.data_dir.mkdir(parents=True)
-        (self.data_dir / "audit.log").write_text("test log entry\n")
-        (self.data_dir / "auth.key").write_text("a" * 64)
-
-        dest = str(self.backup_dir / "test-backup.tar.gz")
-        ok, msg = qubes_remote_ui.create_local_backup(self.data_dir, dest)
+        ok, msg = self.sample_result
         self.assertTrue(ok, msg)
-        self.assertTrue(Path(dest).exists())
-        self.assertGreater(Path(dest).stat().st_size, 0)
+        self.assertTrue(Path(self.sample_archive).exists())
+        self.assertGreater(Path(self.sample_archive).stat().st_size, 0)
 
     def test_create_backup_missing_dir(self):
         """create_local_backup fails for missing directory."""
-        import qubes_remote_ui
-        ok, msg = qubes_remote_ui.create_local_backup(
+        ok, msg = qru.create_local_backup(
             "/nonexistent/dir", "/tmp/test.tar.gz"
         )
         self.assertFalse(ok)
@@ -198,25 +239,37 @@ class TestBackupHelpers(unittest.TestCase):
 
     def test_restore_local_backup(self):
         """restore_local_backup extracts archive correctly."""
-        import qubes_remote_ui
-        self.data_dir.mkdir(parents=True)
-        (self.data_dir / "audit.log").write_text("original data\n")
-
-        dest = str(self.backup_dir / "test.tar.gz")
-        ok, _ = qubes_remote_ui.create_local_backup(self.data_dir, dest)
+        ok, _ = self.sample_result
         self.assertTrue(ok)
 
         # Restore to a new location
         restore_dir = Path(self.tmpdir) / "restored"
         restore_dir.mkdir()
-        ok, msg = qubes_remote_ui.restore_local_backup(dest, str(restore_dir))
+        ok, msg = qru.restore_local_backup(self.sample_archive, str(restore_dir))
         self.assertTrue(ok, msg)
-        self.assertTrue((restore_dir / ".qvm-remote" / "audit.log").exists())
+        self.assertEqual((restore_dir / ".qvm-remote" / "audit.log").read_text(),
+                         "test log entry\n")
+
+    def test_restore_rejects_nested_traversal(self):
+        """restore_local_backup rejects '..' hidden behind a prefix."""
+        import io
+        import tarfile
+        self.backup_dir.mkdir(parents=True)
+        evil = self.backup_dir / "evil.tar.gz"
+        with tarfile.open(str(evil), "w:gz") as tar:
+            info = tarfile.TarInfo(name="foo/../../evil")
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b"x"))
+        restore_dir = Path(self.tmpdir) / "restored"
+        restore_dir.mkdir()
+        ok, msg = qru.restore_local_backup(str(evil), str(restore_dir))
+        self.assertFalse(ok)
+        self.assertIn("Unsafe", msg)
+        self.assertFalse((Path(self.tmpdir) / "evil").exists())
 
     def test_restore_missing_archive(self):
         """restore_local_backup fails for missing archive."""
-        import qubes_remote_ui
-        ok, msg = qubes_remote_ui.restore_local_backup(
+        ok, msg = qru.restore_local_backup(
             "/nonexistent.tar.gz", self.tmpdir
         )
         self.assertFalse(ok)
@@ -224,70 +277,80 @@ class TestBackupHelpers(unittest.TestCase):
 
     def test_list_local_backups(self):
         """list_local_backups finds tar.gz files."""
-        import qubes_remote_ui
         self.backup_dir.mkdir(parents=True)
         for name in ["backup-a.tar.gz", "backup-b.tar.gz", "not-backup.txt"]:
             (self.backup_dir / name).write_text("test")
-        result = qubes_remote_ui.list_local_backups(self.backup_dir)
+        result = qru.list_local_backups(self.backup_dir)
         self.assertEqual(len(result), 2)
         for path, size, mtime in result:
             self.assertTrue(path.endswith(".tar.gz"))
 
     def test_list_backups_empty_dir(self):
         """list_local_backups returns empty for missing directory."""
-        import qubes_remote_ui
-        result = qubes_remote_ui.list_local_backups("/nonexistent")
+        result = qru.list_local_backups("/nonexistent")
         self.assertEqual(result, [])
 
     def test_get_change_summary(self):
         """get_change_summary parses audit log."""
-        import qubes_remote_ui
         self.data_dir.mkdir(parents=True)
         (self.data_dir / "audit.log").write_text(
             "[2026-02-18T12:00:00] SUBMIT id=test1 size=10B\n"
             "[2026-02-18T12:01:00] DONE id=test1 rc=0\n"
         )
-        changes = qubes_remote_ui.get_change_summary(self.data_dir)
+        changes = qru.get_change_summary(self.data_dir)
         self.assertGreaterEqual(len(changes), 2)
         types = [c[1] for c in changes]
         self.assertIn("command", types)
         self.assertIn("result", types)
 
+    def test_get_change_summary_tail(self):
+        """get_change_summary keeps only the last max_entries log lines."""
+        self.data_dir.mkdir(parents=True)
+        (self.data_dir / "audit.log").write_text(
+            "".join(f"[2026-02-18T12:00:{i:02d}] DONE id=t{i} rc=0\n"
+                    for i in range(60))
+        )
+        changes = qru.get_change_summary(self.data_dir, max_entries=5)
+        self.assertEqual([c[0][-2:] for c in changes],
+                         ["55", "56", "57", "58", "59"])
+
+    def test_get_change_summary_precedence(self):
+        """Lines with several keywords take the highest-priority type."""
+        self.data_dir.mkdir(parents=True)
+        (self.data_dir / "audit.log").write_text(
+            "[t1] ERROR on submit id=a\n"
+            "[t2] DONE id=a key=b failed\n"
+            "[t3] auth FAIL\n"
+            "[t4] daemon started\n"
+        )
+        changes = qru.get_change_summary(self.data_dir)
+        self.assertEqual([c[1] for c in changes],
+                         ["command", "key", "error", "log"])
+
     def test_get_change_summary_empty(self):
         """get_change_summary handles missing data gracefully."""
-        import qubes_remote_ui
-        changes = qubes_remote_ui.get_change_summary("/nonexistent")
+        changes = qru.get_change_summary("/nonexistent")
         self.assertEqual(changes, [])
 
     def test_git_backup_push_no_git(self):
         """git_backup_push handles missing git gracefully."""
-        import qubes_remote_ui
         # Temporarily override PATH to hide git
-        old_path = os.environ.get("PATH", "")
-        os.environ["PATH"] = "/nonexistent"
-        try:
-            ok, msg = qubes_remote_ui.git_backup_push(
+        with mock.patch.dict(os.environ, {"PATH": "/nonexistent"}):
+            ok, msg = qru.git_backup_push(
                 self.data_dir, "git@github.com:test/test.git"
             )
             # Should fail gracefully (either no git or no data_dir)
             # Don't assert True because git might not be in the test path
-        finally:
-            os.environ["PATH"] = old_path
 
     def test_git_backup_pull_no_git(self):
         """git_backup_pull handles missing git gracefully."""
-        import qubes_remote_ui
-        old_path = os.environ.get("PATH", "")
-        os.environ["PATH"] = "/nonexistent"
-        try:
-            ok, msg = qubes_remote_ui.git_backup_pull(
+        with mock.patch.dict(os.environ, {"PATH": "/nonexistent"}):
+            ok, msg = qru.git_backup_pull(
                 "git@github.com:test/test.git",
                 str(self.backup_dir / "git"),
             )
-            self.assertFalse(ok)
-            self.assertIn("git", msg.lower())
-        finally:
-            os.environ["PATH"] = old_path
+        self.assertFalse(ok)
+        self.assertIn("git", msg.lower())
 
 
 class TestClientGUI(unittest.TestCase):
@@ -295,70 +358,43 @@ class TestClientGUI(unittest.TestCase):
 
     def test_syntax(self):
         """Client GUI compiles without syntax errors."""
-        import py_compile
-        py_compile.compile(str(GUI_DIR / "qvm-remote-gui"), doraise=True)
+        # In-memory compile of the cached source; no .pyc is written
+        try:
+            compile(_read(CLIENT_GUI), "qvm-remote-gui", "exec")
+        except SyntaxError as e:
+            self.fail(f"Syntax error: {e}")
 
     def test_shebang(self):
         """Client GUI has correct shebang."""
-        with open(GUI_DIR / "qvm-remote-gui") as f:
+        with open(CLIENT_GUI) as f:
             first = f.readline()
         self.assertTrue(first.startswith("#!/usr/bin/python3"))
 
     def test_executable(self):
         """Client GUI is executable."""
-        self.assertTrue(os.access(GUI_DIR / "qvm-remote-gui", os.X_OK))
-
-    def test_contains_gtk_import(self):
-        """Client GUI imports GTK3."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn('gi.require_version("Gtk", "3.0")', content)
-
-    def test_contains_app_class(self):
-        """Client GUI defines the application class."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("class QvmRemoteApp", content)
-        self.assertIn("class QvmRemoteWindow", content)
-
-    def test_contains_all_tabs(self):
-        """Client GUI builds all six tabs."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        for tab in ["_build_execute_tab", "_build_files_tab",
-                     "_build_backup_tab", "_build_history_tab",
-                     "_build_keys_tab", "_build_log_tab"]:
-            self.assertIn(tab, content, f"Missing tab builder: {tab}")
-
-    def test_contains_notifications(self):
-        """Client GUI uses desktop notifications."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("send_notification", content)
-
-    def test_contains_file_transfer(self):
-        """Client GUI has file transfer functionality."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("_on_send_file", content)
-        self.assertIn("_on_fetch_file", content)
-        self.assertIn("_on_copy_between_vms", content)
-
-    def test_contains_backup_features(self):
-        """Client GUI has backup functionality."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("_on_create_local_backup", content)
-        self.assertIn("_on_restore_local_backup", content)
-        self.assertIn("_on_git_push", content)
-        self.assertIn("_on_git_pull", content)
-        self.assertIn("_on_check_dom0_backups", content)
-        self.assertIn("_on_start_dom0_backup", content)
-
-    def test_contains_change_tracking(self):
-        """Client GUI has change tracking."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("_load_changes", content)
-        self.assertIn("get_change_summary", content)
-
-    def test_contains_display_guard(self):
-        """Client GUI checks for display before starting."""
-        content = (GUI_DIR / "qvm-remote-gui").read_text()
-        self.assertIn("check_display", content)
+        self.assertTrue(os.access(CLIENT_GUI, os.X_OK))
+
+    # Feature -> tokens the script must contain; one subTest per feature
+    REQUIRED = {
+        "GTK3 import": ('gi.require_version("Gtk", "3.0")',),
+        "application class": ("class QvmRemoteApp", "class QvmRemoteWindow"),
+        "tab builders": ("_build_execute_tab", "_build_files_tab",
+                         "_build_backup_tab", "_build_history_tab",
+                         "_build_keys_tab", "_build_log_tab"),
+        "notifications": ("send_notification",),
+        "file transfer": ("_on_send_file", "_on_fetch_file", "_on_copy_between_vms"),
+        "backup": ("_on_create_local_backup", "_on_restore_local_backup",
+                   "_on_git_push", "_on_git_pull",
+                   "_on_check_dom0_backups", "_on_start_dom0_backup"),
+        "change tracking": ("_load_changes", "get_change_summary"),
+        "display guard": ("check_display",),
+    }
+
+    def test_contains_required(self):
+        """Client GUI contains every required feature."""
+        for feature, tokens in self.REQUIRED.items():
+            with self.subTest(feature=feature):
+                self.assertEqual(_tokens_present(CLIENT_GUI, tokens), set(tokens))
 
 
 class TestDom0GUI(unittest.TestCase):
@@ -366,161 +402,114 @@ class TestDom0GUI(unittest.TestCase):
 
     def test_syntax(self):
         """Dom0 GUI compiles without syntax errors."""
-        import py_compile
-        py_compile.compile(str(GUI_DIR / "qvm-remote-dom0-gui"), doraise=True)
+        # In-memory compile of the cached source; no .pyc is written
+        try:
+            compile(_read(DOM0_GUI), "qvm-remote-dom0-gui", "exec")
+        except SyntaxError as e:
+            self.fail(f"Syntax error: {e}")
 
     def test_shebang(self):
         """Dom0 GUI has correct shebang."""
-        with open(GUI_DIR / "qvm-remote-dom0-gui") as f:
+        with open(DOM0_GUI) as f:
             first = f.readline()
         self.assertTrue(first.startswith("#!/usr/bin/python3"))
 
     def test_executable(self):
         """Dom0 GUI is executable."""
-        self.assertTrue(os.access(GUI_DIR / "qvm-remote-dom0-gui", os.X_OK))
-
-    def test_contains_gtk_import(self):
-        """Dom0 GUI imports GTK3."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn('gi.require_version("Gtk", "3.0")', content)
-
-    def test_contains_app_class(self):
-        """Dom0 GUI defines the application class."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("class QvmRemoteDom0App", content)
-        self.assertIn("class QvmRemoteDom0Window", content)
-
-    def test_contains_all_tabs(self):
-        """Dom0 GUI builds all four tabs."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        for tab in ["_build_dashboard_tab", "_build_vms_tab",
-                     "_build_backup_tab", "_build_log_tab"]:
-            self.assertIn(tab, content, f"Missing tab builder: {tab}")
-
-    def test_security_warning(self):
-        """Dom0 GUI has security warning for enable autostart."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("complete control over dom0", content)
-
-    def test_contains_notifications(self):
-        """Dom0 GUI uses desktop notifications."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("send_notification", content)
-
-    def test_contains_file_push(self):
-        """Dom0 GUI has file push functionality."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("_on_push_file", content)
-        self.assertIn("Push to VM", content)
-
-    def test_contains_root_warning(self):
-        """Dom0 GUI warns when not running as root."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("Not running as root", content)
-
-    def test_contains_display_guard(self):
-        """Dom0 GUI checks for display before starting."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("check_display", content)
-
-    def test_contains_backup_features(self):
-        """Dom0 GUI has backup functionality."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("_on_create_dom0_backup", content)
-        self.assertIn("_on_backup_service_config", content)
-        self.assertIn("_on_restore_service_config", content)
-        self.assertIn("_refresh_backup_status", content)
-        self.assertIn("qvm-backup", content)
-
-    def test_contains_change_tracking(self):
-        """Dom0 GUI has change tracking."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("_load_dom0_changes", content)
-        self.assertIn("Recent Changes", content)
+        self.assertTrue(os.access(DOM0_GUI, os.X_OK))
+
+    # Feature -> tokens the script must contain; one subTest per feature
+    REQUIRED = {
+        "GTK3 import": ('gi.require_version("Gtk", "3.0")',),
+        "application class": ("class QvmRemoteDom0App", "class QvmRemoteDom0Window"),
+        "tab builders": ("_build_dashboard_tab", "_build_vms_tab",
+                         "_build_backup_tab", "_build_log_tab"),
+        "autostart security warning": ("complete control over dom0",),
+        "notifications": ("send_notification",),
+        "file push": ("_on_push_file", "Push to VM"),
+        "root warning": ("Not running as root",),
+        "display guard": ("check_display",),
+        "backup": ("_on_create_dom0_backup", "_on_backup_service_config",
+                   "_on_restore_service_config", "_refresh_backup_status",
+                   "qvm-backup"),
+        "change tracking": ("_load_dom0_changes", "Recent Changes"),
+    }
+
+    def test_contains_required(self):
+        """Dom0 GUI contains every required feature."""
+        for feature, tokens in self.REQUIRED.items():
+            with self.subTest(feature=feature):
+                self.assertEqual(_tokens_present(DOM0_GUI, tokens), set(tokens))
 
 
 class TestDesktopEntries(unittest.TestCase):
     """Tests for .desktop files."""
 
-    def test_vm_desktop_exists(self):
-        """VM desktop entry exists."""
-        self.assertTrue((GUI_DIR / "qvm-remote-gui.desktop").exists())
-
-    def test_dom0_desktop_exists(self):
-        """Dom0 desktop entry exists."""
-        self.assertTrue((GUI_DIR / "qvm-remote-dom0-gui.desktop").exists())
-
     def test_vm_desktop_valid(self):
         """VM desktop entry has required fields."""
-        content = (GUI_DIR / "qvm-remote-gui.desktop").read_text()
-        self.assertIn("[Desktop Entry]", content)
-        self.assertIn("Name=", content)
-        self.assertIn("Exec=", content)
-        self.assertIn("Type=Application", content)
-        self.assertIn("Terminal=false", content)
+        tokens = ("[Desktop Entry]", "Name=", "Exec=", "Type=Application",
+                  "Terminal=false")
+        self.assertEqual(_tokens_present(GUI_DIR / "qvm-remote-gui.desktop", tokens),
+                         set(tokens))
 
     def test_dom0_desktop_valid(self):
         """Dom0 desktop entry has required fields."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui.desktop").read_text()
-        self.assertIn("[Desktop Entry]", content)
-        self.assertIn("Name=", content)
-        self.assertIn("Exec=", content)
-        self.assertIn("Type=Application", content)
+        tokens = ("[Desktop Entry]", "Name=", "Exec=", "Type=Application")
+        self.assertEqual(_tokens_present(GUI_DIR / "qvm-remote-dom0-gui.desktop", tokens),
+                         set(tokens))
 
 
 class TestPackaging(unittest.TestCase):
     """Tests for RPM specs, PKGBUILD, and Debian packaging."""
 
-    def test_gui_vm_spec_exists(self):
-        """VM GUI RPM spec exists."""
-        self.assertTrue((REPO / "rpm_spec/qvm-remote-gui-vm.spec").exists())
-
-    def test_gui_dom0_spec_exists(self):
-        """Dom0 GUI RPM spec exists."""
-        self.assertTrue((REPO / "rpm_spec/qvm-remote-gui-dom0.spec").exists())
+    # Directory -> files the GUI build and packaging need in it
+    REQUIRED_FILES = {
+        GUI_DIR: {"qubes_remote_ui.py", "qvm-remote-gui", "qvm-remote-dom0-gui",
+                  "qvm-remote-gui.desktop", "qvm-remote-dom0-gui.desktop"},
+        REPO / "rpm_spec": {"qvm-remote-gui-vm.spec", "qvm-remote-gui-dom0.spec"},
+        REPO / "pkg": {"PKGBUILD-gui"},
+        REPO / "debian": {"control", "rules"},
+    }
+
+    def test_required_files_present(self):
+        """GUI scripts, desktop entries and packaging files all exist."""
+        missing = []
+        for directory, names in self.REQUIRED_FILES.items():
+            try:
+                present = set(os.listdir(directory))
+            except FileNotFoundError:
+                present = set()
+            missing += [f"{directory.relative_to(REPO)}/{name}"
+                        for name in sorted(names - present)]
+        self.assertEqual(missing, [])
 
     def test_gui_vm_spec_requires(self):
         """VM GUI spec requires GTK3 and PyGObject."""
-        content = (REPO / "rpm_spec/qvm-remote-gui-vm.spec").read_text()
-        self.assertIn("python3-gobject", content)
-        self.assertIn("gtk3", content)
-        self.assertIn("qvm-remote", content)
+        tokens = ("python3-gobject", "gtk3", "qvm-remote")
+        self.assertEqual(_tokens_present(REPO / "rpm_spec/qvm-remote-gui-vm.spec", tokens),
+                         set(tokens))
 
     def test_gui_dom0_spec_requires(self):
         """Dom0 GUI spec requires GTK3, PyGObject, and qubes-core-dom0."""
-        content = (REPO / "rpm_spec/qvm-remote-gui-dom0.spec").read_text()
-        self.assertIn("python3-gobject", content)
-        self.assertIn("gtk3", content)
-        self.assertIn("qubes-core-dom0", content)
-
-    def test_pkgbuild_gui_exists(self):
-        """Arch GUI PKGBUILD exists."""
-        self.assertTrue((REPO / "pkg/PKGBUILD-gui").exists())
+        tokens = ("python3-gobject", "gtk3", "qubes-core-dom0")
+        self.assertEqual(_tokens_present(REPO / "rpm_spec/qvm-remote-gui-dom0.spec", tokens),
+                         set(tokens))
 
     def test_pkgbuild_gui_deps(self):
         """Arch GUI PKGBUILD has correct dependencies."""
-        content = (REPO / "pkg/PKGBUILD-gui").read_text()
-        self.assertIn("python-gobject", content)
-        self.assertIn("gtk3", content)
-        self.assertIn("qvm-remote", content)
-
-    def test_debian_control_exists(self):
-        """Debian control file exists."""
-        self.assertTrue((REPO / "debian/control").exists())
+        tokens = ("python-gobject", "gtk3", "qvm-remote")
+        self.assertEqual(_tokens_present(REPO / "pkg/PKGBUILD-gui", tokens), set(tokens))
 
     def test_debian_gui_package(self):
         """Debian control defines qvm-remote-gui package."""
-        content = (REPO / "debian/control").read_text()
-        self.assertIn("Package: qvm-remote-gui", content)
-        self.assertIn("python3-gi", content)
-        self.assertIn("gir1.2-gtk-3.0", content)
+        tokens = ("Package: qvm-remote-gui", "python3-gi", "gir1.2-gtk-3.0")
+        self.assertEqual(_tokens_present(REPO / "debian/control", tokens), set(tokens))
 
     def test_debian_rules(self):
         """Debian rules is executable and calls make."""
         rules = REPO / "debian/rules"
-        self.assertTrue(rules.exists())
         self.assertTrue(os.access(rules, os.X_OK))
-        content = rules.read_text()
+        content = _read(rules)
         self.assertIn("install-gui-vm", content)
 
 
@@ -529,28 +518,26 @@ class TestMakefile(unittest.TestCase):
 
     def test_makefile_gui_targets(self):
         """Makefile has all GUI-related targets."""
-        content = (REPO / "Makefile").read_text()
-        for target in ["install-gui-vm", "install-gui-dom0",
-                        "uninstall-gui-vm", "uninstall-gui-dom0"]:
-            self.assertIn(f"{target}:", content, f"Missing target: {target}")
+        targets = ("install-gui-vm:", "install-gui-dom0:",
+                   "uninstall-gui-vm:", "uninstall-gui-dom0:")
+        self.assertEqual(_tokens_present(MAKEFILE, targets), set(targets),
+                         "Missing target")
 
     def test_makefile_gui_check(self):
         """Makefile check target includes GUI files."""
-        content = (REPO / "Makefile").read_text()
-        self.assertIn("gui/qubes_remote_ui.py", content)
-        self.assertIn("gui/qvm-remote-gui", content)
-        self.assertIn("gui/qvm-remote-dom0-gui", content)
+        tokens = ("gui/qubes_remote_ui.py", "gui/qvm-remote-gui",
+                  "gui/qvm-remote-dom0-gui")
+        self.assertEqual(_tokens_present(MAKEFILE, tokens), set(tokens))
 
     def test_makefile_gui_test(self):
         """Makefile has gui-test target."""
-        content = (REPO / "Makefile").read_text()
+        content = _read(MAKEFILE)
         self.assertIn("gui-test:", content)
 
     def test_makefile_libdir(self):
         """Makefile installs shared module to LIBDIR."""
-        content = (REPO / "Makefile").read_text()
-        self.assertIn("qubes_remote_ui.py", content)
-        self.assertIn("LIBDIR", content)
+        tokens = ("qubes_remote_ui.py", "LIBDIR")
+        self.assertEqual(_tokens_present(MAKEFILE, tokens), set(tokens))
 
 
 class TestUIConventions(unittest.TestCase):
@@ -558,39 +545,54 @@ class TestUIConventions(unittest.TestCase):
 
     def test_no_acronyms_in_labels(self):
         """User-facing text avoids unnecessary acronyms."""
-        for filename in ["qvm-remote-gui", "qvm-remote-dom0-gui"]:
-            content = (GUI_DIR / filename).read_text()
+        for path in GUI_SCRIPTS:
             # Check that labels use full words where Qubes guidelines apply
             # "VM" is acceptable as it's standard Qubes terminology
-            self.assertNotIn('"DVM"', content, f"Acronym 'DVM' in {filename}")
-            self.assertNotIn('"NetVM"', content, f"Acronym 'NetVM' in {filename}")
+            found = _tokens_present(path, ('"DVM"', '"NetVM"'))
+            self.assertFalse(found, f"Acronyms {sorted(found)} in {path.name}")
 
     def test_gtk3_required(self):
         """Both GUIs require GTK 3.0 (not GTK 4)."""
-        for filename in ["qvm-remote-gui", "qvm-remote-dom0-gui"]:
-            content = (GUI_DIR / filename).read_text()
-            self.assertIn('gi.require_version("Gtk", "3.0")', content)
-            self.assertNotIn('gi.require_version("Gtk", "4.0")', content)
+        for path in GUI_SCRIPTS:
+            found = _tokens_present(path, ('gi.require_version("Gtk", "3.0")',
+                                           'gi.require_version("Gtk", "4.0")'))
+            self.assertEqual(found, {'gi.require_version("Gtk", "3.0")'}, path.name)
 
     def test_application_ids(self):
         """Application IDs follow reverse-DNS convention."""
-        for filename in ["qvm-remote-gui", "qvm-remote-dom0-gui"]:
-            content = (GUI_DIR / filename).read_text()
+        for path in GUI_SCRIPTS:
+            content = _read(path)
             self.assertIn("org.qubes-os.", content)
 
     def test_error_dialogs_available(self):
         """Both GUIs use proper error dialogs."""
-        for filename in ["qvm-remote-gui", "qvm-remote-dom0-gui"]:
-            content = (GUI_DIR / filename).read_text()
+        for path in GUI_SCRIPTS:
+            content = _read(path)
             self.assertIn("show_error_dialog", content)
 
     def test_confirm_before_destructive(self):
         """Destructive actions require confirmation."""
-        content = (GUI_DIR / "qvm-remote-dom0-gui").read_text()
-        self.assertIn("show_confirm_dialog", content)
         # Revoke, stop, enable should all require confirmation
-        self.assertIn("Revoke", content)
+        tokens = ("show_confirm_dialog", "Revoke")
+        self.assertEqual(_tokens_present(DOM0_GUI, tokens), set(tokens))
 
 
-if __name__ == "__main__":
+def _main():
+    """Run under pytest-xdist when installed, else plain unittest.
+
+    Naming specific tests (unittest-style selectors) always uses unittest,
+    so 'python3 test/test_gui.py TestBackupHelpers' keeps working.
+    """
+    if all(arg.startswith("-") for arg in sys.argv[1:]):
+        try:
+            import pytest
+            import xdist  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            sys.exit(pytest.main([__file__, "-n", "auto", "-q"] + sys.argv[1:]))
     unittest.main(verbosity=2)
+
+
+if __name__ == "__main__":
+    _main()